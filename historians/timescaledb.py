@@ -11,7 +11,7 @@ import logging
 from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
-from collections import defaultdict
+from collections import defaultdict, deque
 
 logger = logging.getLogger(__name__)
 
@@ -73,9 +73,10 @@ class TimescaleDBHistorian:
         self.connection = None
         self.is_connected = False
         
-        # In-memory storage (mock mode or fallback)
-        self.mock_measurements: List[MeasurementPoint] = []
-        self.mock_alarms: List[Dict] = []
+        # In-memory storage (mock mode or fallback), oldest entries
+        # evicted once max_storage_size is reached
+        self.mock_measurements: deque = deque(maxlen=max_storage_size)
+        self.mock_alarms: deque = deque(maxlen=max_storage_size)
         
         # Statistics
         self.measurements_stored = 0
@@ -146,12 +147,8 @@ class TimescaleDBHistorian:
                 return False
             
             if self.use_mock:
-                # In-memory storage
+                # In-memory storage (bounded deque drops the oldest entry)
                 self.mock_measurements.append(measurement)
-                
-                # Trim old data if exceeding size limit
-                if len(self.mock_measurements) > self.max_storage_size:
-                    self.mock_measurements = self.mock_measurements[-self.max_storage_size:]
             else:
                 # Database storage would go here
                 pass
@@ -214,8 +211,6 @@ class TimescaleDBHistorian:
             
             if self.use_mock:
                 self.mock_alarms.append(alarm)
-                if len(self.mock_alarms) > self.max_storage_size:
-                    self.mock_alarms = self.mock_alarms[-self.max_storage_size:]
             else:
                 # Database storage would go here
                 pass
@@ -473,14 +468,14 @@ class TimescaleDBHistorian:
             
             if self.use_mock:
                 # In-memory cleanup
-                self.mock_measurements = [
-                    m for m in self.mock_measurements 
-                    if m.time >= cutoff_time
-                ]
-                self.mock_alarms = [
-                    a for a in self.mock_alarms 
-                    if a['time'] >= cutoff_time
-                ]
+                self.mock_measurements = deque(
+                    (m for m in self.mock_measurements if m.time >= cutoff_time),
+                    maxlen=self.max_storage_size,
+                )
+                self.mock_alarms = deque(
+                    (a for a in self.mock_alarms if a['time'] >= cutoff_time),
+                    maxlen=self.max_storage_size,
+                )
             else:
                 # Database cleanup would go here
                 pass
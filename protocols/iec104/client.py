@@ -234,27 +234,40 @@ class IEC104Client:
         if not self.reader:
             return None
         
+        buf = self.rx_buffer
         try:
-            # Receive data with timeout
-            while len(self.rx_buffer) < 6:
+            # Receive until one whole frame (per its length octet) is buffered
+            while True:
+                if len(buf) >= 2:
+                    # Validate the header before trusting the length octet
+                    need = buf[1] + 2
+                    if buf[0] != 0x68 or need < 6 or need > 255:
+                        # Skip ahead to the next start byte in one scan
+                        APDU.skip_to_start(buf)
+                        continue
+                    if len(buf) >= need:
+                        break
+                
                 chunk = await asyncio.wait_for(
                     self.reader.read(1024),
                     timeout=timeout
                 )
                 if not chunk:
                     raise Exception("Connection closed")
-                self.rx_buffer.extend(chunk)
+                buf.extend(chunk)
             
-            # Try to decode APDU
+            # Decode through a memoryview of exactly one frame, no copy
             try:
-                apdu, consumed = APDU.decode(bytes(self.rx_buffer))
-                self.rx_buffer = self.rx_buffer[consumed:]
+                apdu, _ = APDU.decode(memoryview(buf)[:need])
+            except ValueError as e:
+                logger.warning(f"Invalid APDU from {self.host}: {e}")
+                apdu = None
+            
+            # Framing is valid, so drop exactly this frame either way
+            del buf[:need]
+            if apdu is not None:
                 self.last_activity = datetime.now()
-                return apdu
-            except ValueError:
-                # Invalid APDU, skip one byte
-                self.rx_buffer.pop(0)
-                return None
+            return apdu
         
         except asyncio.TimeoutError:
             return None
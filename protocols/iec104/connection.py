@@ -30,6 +30,16 @@ from enum import Enum
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 import asyncio
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+
+# Bound on queued outgoing APDUs. Should track the IEC 104 k parameter
+# (max unacknowledged I frames, default 12). A peer that falls this far
+# behind is disconnected instead of growing memory without limit.
+TX_QUEUE_SIZE = 16
 
 
 class ConnectionState(Enum):
@@ -42,11 +52,14 @@ class ConnectionState(Enum):
     TIMEOUT = 5         # No response to keep-alive
 
 
-@dataclass
+@dataclass(eq=False)
 class ConnectionStateMachine:
     """
     IEC 104 connection state machine
     
+    Compared and hashed by identity so the server can keep connections
+    in a set.
+    
     Attributes:
         state: Current connection state
         remote_address: Client TCP address
@@ -55,6 +68,9 @@ class ConnectionStateMachine:
         last_send_time: Timestamp of last sent message
         last_recv_time: Timestamp of last received message
         testfr_active: Whether we're waiting for TESTFR_CON
+        tx_queue: Encoded frames waiting for the client's writer task
+        writer: Client stream writer (owned by the writer task)
+        idle_timeout_s: Receive idle timeout armed by arm_idle_timer
     """
     
     remote_address: str
@@ -66,6 +82,8 @@ class ConnectionStateMachine:
     testfr_active: bool = False
     rx_buffer: bytearray = None
     tx_queue: asyncio.Queue = None
+    writer: asyncio.StreamWriter = None
+    idle_timeout_s: float = 120
     
     def __post_init__(self):
         self.last_send_time = datetime.now()
@@ -73,7 +91,9 @@ class ConnectionStateMachine:
         if self.rx_buffer is None:
             self.rx_buffer = bytearray()
         if self.tx_queue is None:
-            self.tx_queue = asyncio.Queue()
+            self.tx_queue = asyncio.Queue(maxsize=TX_QUEUE_SIZE)
+        self._idle_timer: asyncio.TimerHandle = None
+        self._on_idle = None
     
     def on_connected(self):
         """Handle TCP connection established"""
@@ -115,8 +135,12 @@ class ConnectionStateMachine:
         return False
     
     def on_data_received(self):
-        """Update timestamp when data received"""
+        """Update timestamp when data received and re-arm the idle timer"""
         self.last_recv_time = datetime.now()
+        if self._idle_timer is not None:
+            self._idle_timer.cancel()
+            self._idle_timer = asyncio.get_running_loop().call_later(
+                self.idle_timeout_s, self._on_idle, self)
     
     def on_data_sent(self):
         """Update sequence and timestamp on send"""
@@ -156,6 +180,21 @@ class ConnectionStateMachine:
         elapsed = (datetime.now() - self.last_recv_time).total_seconds()
         return elapsed > idle_timeout_s
     
+    def arm_idle_timer(self, idle_timeout_s: float, on_idle):
+        """
+        Arm a one-shot receive idle timer
+        
+        on_idle(conn) is called from the event loop if no data arrives for
+        idle_timeout_s. Every on_data_received() pushes the deadline back,
+        so idle connections cost no periodic polling.
+        """
+        self.idle_timeout_s = idle_timeout_s
+        self._on_idle = on_idle
+        if self._idle_timer is not None:
+            self._idle_timer.cancel()
+        self._idle_timer = asyncio.get_running_loop().call_later(
+            idle_timeout_s, on_idle, self)
+    
     def check_keep_alive(self, keep_alive_s: int = 30) -> bool:
         """
         Check if keep-alive (TESTFR) transmission is needed
@@ -183,11 +222,14 @@ class ConnectionStateMachine:
     def on_error(self, error: str):
         """Handle connection error"""
         self.state = ConnectionState.ERROR
-        print(f"IEC104 Connection Error [{self.remote_address}]: {error}")
+        logger.error("IEC104 Connection Error [%s]: %s", self.remote_address, error)
     
     def disconnect(self):
         """Mark connection as disconnected"""
         self.state = ConnectionState.IDLE
+        if self._idle_timer is not None:
+            self._idle_timer.cancel()
+            self._idle_timer = None
     
     def __str__(self):
         return (f"IEC104[{self.remote_address}] state={self.state.name} "
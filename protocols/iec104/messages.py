@@ -20,9 +20,29 @@ APDU types:
 
 from dataclasses import dataclass, asdict
 from enum import IntEnum
-from typing import List, Optional, Tuple
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
 import struct
 
+import numpy as np
+
+
+# Pre-compiled packers for the writer-style encode_into() path
+_APCI_STRUCT = struct.Struct('<HH')          # Control field as two LE words
+_APCI_WORD_STRUCT = struct.Struct('<I')      # Control field as one LE word
+_I_FRAME_HEADER_STRUCT = struct.Struct('<BBHH')  # Start, length, SSN, RSN
+_FLOAT_STRUCT = struct.Struct('<f')          # IEEE 754 short float
+_ASDU_HEADER_STRUCT = struct.Struct('<BBBBH')  # Type, VSQ, COT, originator, CA
+_IOA_STRUCT = struct.Struct('<3s')           # 3-byte information object address
+_IOA_BYTE_STRUCT = struct.Struct('<3sB')     # IOA + single status/command byte
+_IOA_SCALED_STRUCT = struct.Struct('<3sHB')  # IOA + scaled value + QDS
+_IOA_FLOAT_STRUCT = struct.Struct('<3sfB')   # IOA + IEEE 754 float + QDS
+
+
+def _reserve(buf: bytearray, end: int):
+    """Grow buf (if needed) so that buf[:end] is addressable"""
+    if len(buf) < end:
+        buf.extend(bytes(end - len(buf)))
+
 
 class TypeID(IntEnum):
     """IEC 60870-5-101/104 Object Information Types"""
@@ -112,6 +132,15 @@ class UFrameFunction(IntEnum):
     TESTFR_CON = 0x83      # Test frame (confirmation)
 
 
+# U frames carry no sequence numbers, so the control field is fully
+# determined by the function code: precompute byte 0 and the 4 APCI bytes
+_UFRAME_BYTE0 = {f: 0x03 | ((f.value & 0x3F) << 2) for f in UFrameFunction}
+_UFRAME_APCI = {f: bytes([b0, 0, 0, 0]) for f, b0 in _UFRAME_BYTE0.items()}
+# Decode side: function code (control bits 2-7) to enum member, so decode
+# does a dict lookup instead of an Enum call per U frame
+_UFRAME_BY_CODE = {f.value: f for f in UFrameFunction if f.value <= 0x3F}
+
+
 @dataclass
 class APCI:
     """Application Protocol Control Information"""
@@ -121,48 +150,51 @@ class APCI:
     u_function: Optional[UFrameFunction] = None  # For U frames
     
     def encode(self) -> bytes:
+        """Encode APCI to 4 bytes"""
+        if self.frame_type == APDUType.U_FRAME:
+            return _UFRAME_APCI[self.u_function]
+        
+        buf = bytearray(4)
+        self.encode_into(buf, 0)
+        return bytes(buf)
+    
+    def encode_into(self, buf: bytearray, off: int) -> int:
         """
-        Encode APCI to 4 bytes
+        Encode APCI (4 bytes) into buf at offset off
         
         Format:
             Bytes 0-1: Control octet and send sequence
             Bytes 2-3: Control octet and receive sequence
         
-        I frame: bit 0 of byte 0 = 0
-            b0: SSN[0:7] | control[1] | control[0]=0
-            b1: SSN[8:14] | control[15]
-            b2: RSN[0:7] | control[1]=1(?) | control[0]=0(?)
-            b3: RSN[8:14] | control[15]=?
+        I frame: bit 0 of byte 0 = 0, SSN in bits 1-15 of bytes 0-1,
+                 RSN in bits 1-15 of bytes 2-3
+        S frame: bits 0-1 of byte 0 = 01b, only RSN present
+        U frame: bits 0-1 of byte 0 = 11b, function code in bits 2-7
+        
+        Returns:
+            Offset just past the written APCI
         """
+        _reserve(buf, off + 4)
+        
         if self.frame_type == APDUType.I_FRAME:
-            # I frame: control bits = 0x00 in position 0-1
-            # SSN split: bits 1-15 of bytes 0-1
-            # RSN split: bits 1-15 of bytes 2-3
-            byte0 = (self.send_sequence << 1) & 0xFF
-            byte1 = (self.send_sequence >> 7) & 0xFF
-            byte2 = (self.receive_sequence << 1) & 0xFF
-            byte3 = (self.receive_sequence >> 7) & 0xFF
-            return bytes([byte0, byte1, byte2, byte3])
+            # Each 16-bit little-endian word carries a sequence number << 1
+            _APCI_STRUCT.pack_into(buf, off,
+                                   (self.send_sequence << 1) & 0xFFFF,
+                                   (self.receive_sequence << 1) & 0xFFFF)
             
         elif self.frame_type == APDUType.S_FRAME:
-            # S frame: control bits = 0x01 in position 0-1 (bit 0=1)
             # SSN unused, only RSN in bytes 2-3
-            byte0 = 0x01  # Control=01b
-            byte1 = 0x00
-            byte2 = (self.receive_sequence << 1) & 0xFF
-            byte3 = (self.receive_sequence >> 7) & 0xFF
-            return bytes([byte0, byte1, byte2, byte3])
+            _APCI_STRUCT.pack_into(buf, off, 0x0001,
+                                   (self.receive_sequence << 1) & 0xFFFF)
             
         elif self.frame_type == APDUType.U_FRAME:
-            # U frame: control bits = 0x03 in position 0-3
             # Bits 2-7 contain function code
-            byte0 = 0x03 | ((self.u_function & 0x3F) << 2)
-            byte1 = 0x00
-            byte2 = 0x00
-            byte3 = 0x00
-            return bytes([byte0, byte1, byte2, byte3])
+            _APCI_STRUCT.pack_into(buf, off, _UFRAME_BYTE0[self.u_function], 0)
+        
+        else:
+            return off
         
-        return b''
+        return off + 4
     
     @staticmethod
     def decode(data: bytes) -> Tuple['APCI', int]:
@@ -170,31 +202,81 @@ class APCI:
         if len(data) < 4:
             raise ValueError("APCI too short")
         
-        b0, b1, b2, b3 = data[0], data[1], data[2], data[3]
+        # Load all 4 control octets as one little-endian 32-bit word:
+        # SSN lives in bits 1-15, RSN in bits 17-31
+        w, = _APCI_WORD_STRUCT.unpack_from(data)
         
-        # Determine frame type from bit 0
-        bit0 = b0 & 0x01
-        bit1 = (b0 >> 1) & 0x01
+        # Determine frame type from control bits 0-1
+        control = w & 0x03
         
-        if bit0 == 0:  # I frame (control bit 0 = 0)
-            # Extract SSN from bits 1-15 of bytes 0-1
-            # Byte 0 bits 1-7 = SSN[0:7], Byte 1 bits 0-7 = SSN[7:15]
-            send_seq = ((b0 >> 1) & 0x7F) | ((b1 & 0xFF) << 7)
-            # Extract RSN from bits 1-15 of bytes 2-3
-            recv_seq = ((b2 >> 1) & 0x7F) | ((b3 & 0xFF) << 7)
-            return APCI(APDUType.I_FRAME, send_seq, recv_seq), 4
+        if not control & 0x01:  # I frame (control bit 0 = 0)
+            return APCI(APDUType.I_FRAME, (w >> 1) & 0x7FFF, (w >> 17) & 0x7FFF), 4
             
-        elif bit0 == 1 and bit1 == 0:  # S frame (control bits = 01b)
+        elif control == 0x01:  # S frame (control bits = 01b)
             # No SSN, only RSN in bytes 2-3
-            recv_seq = ((b2 >> 1) & 0x7F) | ((b3 & 0xFF) << 7)
-            return APCI(APDUType.S_FRAME, 0, recv_seq), 4
+            return APCI(APDUType.S_FRAME, 0, (w >> 17) & 0x7FFF), 4
             
-        elif (b0 & 0x03) == 0x03:  # U frame (control bits = 11b)
+        elif control == 0x03:  # U frame (control bits = 11b)
             # Function code in bits 2-7
-            u_func = (b0 >> 2) & 0x3F
-            return APCI(APDUType.U_FRAME, 0, 0, UFrameFunction(u_func)), 4
+            u_func = _UFRAME_BY_CODE.get((w >> 2) & 0x3F)
+            if u_func is None:
+                raise ValueError(f"Invalid U frame function: 0x{(w >> 2) & 0x3F:02x}")
+            return APCI(APDUType.U_FRAME, 0, 0, u_func), 4
         
-        raise ValueError(f"Invalid APCI control bits in byte 0: 0x{b0:02x}")
+        raise ValueError(f"Invalid APCI control bits in byte 0: 0x{w & 0xFF:02x}")
+
+
+# Per-type information object layouts: (encoded size, packer, value fields).
+# The object address (3 bytes, little-endian) always comes first; types not
+# listed encode the address only.
+_OBJECT_LAYOUTS = {
+    TypeID.M_SP_NA_1: (4, '_IOA_BYTE_STRUCT',       # Single point (0/1)
+                       'o.quality | (1 if o.value else 0)'),
+    TypeID.M_DP_NA_1: (4, '_IOA_BYTE_STRUCT',       # Double point
+                       'o.quality | (int(o.value) & 0x03)'),
+    TypeID.M_ME_NB_1: (6, '_IOA_SCALED_STRUCT',     # Scaled integer
+                       'int(o.value) & 0xFFFF, o.quality'),
+    TypeID.M_ME_NC_1: (8, '_IOA_FLOAT_STRUCT',      # Short floating point
+                       'o.value, o.quality'),
+    TypeID.C_SC_NA_1: (4, '_IOA_BYTE_STRUCT',       # Single command
+                       'int(o.value) & 0x01'),
+    TypeID.C_DC_NA_1: (4, '_IOA_BYTE_STRUCT',       # Double command
+                       'int(o.value) & 0x01'),
+}
+_DEFAULT_OBJECT_LAYOUT = (3, '_IOA_STRUCT', '')
+
+_OBJECT_ENCODER_TEMPLATE = """
+def encode_object(o, buf, off, _pack={packer}.pack_into):
+    end = off + {size}
+    if len(buf) < end:
+        buf.extend(bytes(end - len(buf)))
+    _pack(buf, off, (o.information_object_address & 0xFFFFFF).to_bytes(3, 'little'){fields})
+    return end
+"""
+
+# Specialized object encoders, generated on first use of each type ID
+_CACHED_ENCODERS: Dict[int, Callable[['ObjectAddress', bytearray, int], int]] = {}
+
+
+def _build_object_encoder(type_id: int) -> Callable[['ObjectAddress', bytearray, int], int]:
+    """
+    Generate and cache an encoder with the layout for type_id inlined
+    
+    Removes the per-object type dispatch from ASDU encoding.
+    """
+    size, packer, fields = _OBJECT_LAYOUTS.get(type_id, _DEFAULT_OBJECT_LAYOUT)
+    source = _OBJECT_ENCODER_TEMPLATE.format(
+        packer=packer, size=size, fields=f", {fields}" if fields else "")
+    namespace = {packer: globals()[packer]}
+    exec(compile(source, f"<iec104 encoder {type_id}>", "exec"), namespace)
+    
+    encoder = namespace['encode_object']
+    _CACHED_ENCODERS[type_id] = encoder
+    return encoder
+
+
+# Shared empty object sequence; ASDUs only get their own list on first append
+_EMPTY: Tuple[ObjectAddress, ...] = ()
 
 
 @dataclass
@@ -204,77 +286,92 @@ class ASDU:
     cause: CauseOfTransmission
     originator: int = 0  # Originator address (0 in station)
     common_address: int = 1  # Common ASDU address
-    objects: List[ObjectAddress] = None
+    objects: Sequence[ObjectAddress] = None  # list, or shared empty tuple
+    # Raw (ioa, value, quality) arrays when decoded with decode_mode='raw'
+    objects_soa: Optional[Tuple[np.ndarray, ...]] = None
     
     def __post_init__(self):
         if self.objects is None:
-            self.objects = []
+            self.objects = _EMPTY
+    
+    def append_object(self, obj: ObjectAddress):
+        """Append an information object, upgrading the empty sentinel to a list"""
+        if isinstance(self.objects, tuple):
+            self.objects = list(self.objects)
+        self.objects.append(obj)
+    
+    def iter_objects(self) -> Iterator[ObjectAddress]:
+        """
+        Iterate information objects regardless of decode mode
+        
+        For raw (SoA) decoded ASDUs the ObjectAddress instances are only
+        built on demand.
+        """
+        if self.objects_soa is None:
+            yield from self.objects
+            return
+        
+        ioas, values, qualities = self.objects_soa
+        for ioa, value, quality in zip(ioas.tolist(), values.tolist(),
+                                       qualities.tolist()):
+            yield ObjectAddress(ioa, self.type_id, self.cause, value, quality)
     
     def encode(self) -> bytes:
         """Encode ASDU to bytes"""
-        result = bytearray()
-        
-        # Type ID (1 byte)
-        result.append(self.type_id)
+        buf = bytearray()
+        self.encode_into(buf, 0)
+        return bytes(buf)
+    
+    def encode_into(self, buf: bytearray, off: int) -> int:
+        """
+        Encode ASDU into buf at offset off
         
-        # Variable structure qualifier (1 byte)
-        # bit 7=1 (no sequence), bits 0-6=number of objects
-        num_objects = len(self.objects)
-        result.append(0x80 | (num_objects & 0x7F))
+        Returns:
+            Offset just past the last written information object
+        """
+        _reserve(buf, off + 6)
         
-        # Cause of Transmission (2 bytes)
-        # bit 7=0 (positive), bits 0-5=COT code, bits 6=test, bit 7=negative
-        test_bit = 0x00
-        cot_byte = (self.cause & 0x3F) | test_bit
-        result.append(cot_byte)
-        result.append(self.originator)
+        # Raw (SoA) decoded ASDUs keep their objects in objects_soa
+        objects = self.objects
+        if self.objects_soa is not None:
+            objects = list(self.iter_objects())
         
+        # Type ID (1 byte)
+        # Variable structure qualifier (1 byte):
+        #   bit 7=1 (no sequence), bits 0-6=number of objects
+        # Cause of Transmission (2 bytes):
+        #   bits 0-5=COT code, bit 6=test, bit 7=negative; then originator
         # Common address (2 bytes, little-endian)
-        result.append(self.common_address & 0xFF)
-        result.append((self.common_address >> 8) & 0xFF)
+        test_bit = 0x00
+        _ASDU_HEADER_STRUCT.pack_into(
+            buf, off,
+            self.type_id,
+            0x80 | (len(objects) & 0x7F),
+            (self.cause & 0x3F) | test_bit,
+            self.originator,
+            self.common_address & 0xFFFF,
+        )
+        off += 6
         
         # Information objects
-        for obj in self.objects:
-            obj_bytes = self._encode_object(obj)
-            result.extend(obj_bytes)
+        for obj in objects:
+            off = self._encode_object_into(obj, buf, off)
         
-        return bytes(result)
+        return off
     
     def _encode_object(self, obj: ObjectAddress) -> bytes:
         """Encode single information object"""
-        result = bytearray()
-        
-        # Object address (3 bytes, little-endian)
-        result.append(obj.information_object_address & 0xFF)
-        result.append((obj.information_object_address >> 8) & 0xFF)
-        result.append((obj.information_object_address >> 16) & 0xFF)
-        
-        # Value encoding depends on type ID
-        if obj.type_id == TypeID.M_SP_NA_1:  # Single point (0/1)
-            result.append(obj.quality | (1 if obj.value else 0))
-            
-        elif obj.type_id == TypeID.M_DP_NA_1:  # Double point (0/1/transitional)
-            dp_value = int(obj.value) & 0x03
-            result.append(obj.quality | dp_value)
-            
-        elif obj.type_id == TypeID.M_ME_NB_1:  # Scaled integer
-            val = int(obj.value) & 0xFFFF
-            result.append(val & 0xFF)
-            result.append((val >> 8) & 0xFF)
-            result.append(obj.quality)
-            
-        elif obj.type_id == TypeID.M_ME_NC_1:  # Short floating point
-            # IEEE 754 single precision (4 bytes)
-            import struct
-            float_bytes = struct.pack('<f', obj.value)
-            result.extend(float_bytes)
-            result.append(obj.quality)
-            
-        elif obj.type_id in [TypeID.C_SC_NA_1, TypeID.C_DC_NA_1]:
-            # Control command
-            result.append(int(obj.value) & 0x01)
-        
-        return bytes(result)
+        buf = bytearray()
+        self._encode_object_into(obj, buf, 0)
+        return bytes(buf)
+    
+    def _encode_object_into(self, obj: ObjectAddress, buf: bytearray,
+                            off: int) -> int:
+        """Encode single information object into buf at offset off"""
+        encoder = _CACHED_ENCODERS.get(obj.type_id)
+        if encoder is None:
+            encoder = _build_object_encoder(obj.type_id)
+        return encoder(obj, buf, off)
 
 
 @dataclass
@@ -285,26 +382,46 @@ class APDU:
     
     def encode(self) -> bytes:
         """Encode complete APDU to bytes"""
-        # Encode ASDU if present
-        asdu_bytes = self.asdu.encode() if self.asdu else b''
+        buf = bytearray()
+        self.encode_into(buf, 0)
+        return bytes(buf)
+    
+    def encode_into(self, buf: bytearray, off: int) -> int:
+        """
+        Encode complete APDU into buf at offset off
         
-        # APDU header: start byte + length
-        result = bytearray()
-        result.append(0x68)  # Start byte
-        result.append(len(asdu_bytes) + 4)  # Length (ASDU + APCI)
+        Writes the ASDU first (after the 6 byte header) so the length
+        octet is known without encoding into a temporary buffer.
         
-        # Encode APCI (4 bytes)
-        apci_bytes = self.apci.encode()
-        result.extend(apci_bytes)
+        Returns:
+            Offset just past the end of the APDU
+        """
+        _reserve(buf, off + 6)
         
         # Add ASDU
-        result.extend(asdu_bytes)
+        end = off + 6
+        if self.asdu is not None:
+            end = self.asdu.encode_into(buf, end)
+        
+        # APDU header: start byte + length (ASDU + APCI)
+        buf[off] = 0x68
+        buf[off + 1] = end - off - 2
         
-        return bytes(result)
+        # Encode APCI (4 bytes)
+        self.apci.encode_into(buf, off + 2)
+        
+        return end
     
     @staticmethod
-    def decode(data: bytes) -> Tuple['APDU', int]:
-        """Decode APDU and return consumed bytes"""
+    def decode(data: bytes, decode_mode: str = 'objects') -> Tuple['APDU', int]:
+        """
+        Decode APDU and return consumed bytes
+        
+        Args:
+            data: Buffer starting with the 0x68 start byte
+            decode_mode: 'objects' for ObjectAddress list, 'raw' for
+                numpy (ioa, value, quality) arrays in ASDU.objects_soa
+        """
         if len(data) < 6:
             raise ValueError("APDU too short")
         
@@ -315,18 +432,30 @@ class APDU:
         if len(data) < 2 + length:
             raise ValueError("Incomplete APDU")
         
+        # Zero-copy views: slicing a memoryview does not copy the payload
+        view = memoryview(data)
+        
         # Decode APCI
-        apci_bytes = data[2:6]
-        apci, _ = APCI.decode(apci_bytes)
+        apci, _ = APCI.decode(view[2:6])
         
         # Decode ASDU if present
         asdu = None
         if length > 4:
-            asdu_bytes = data[6:2+length]
-            asdu = ASDU.decode_from_bytes(asdu_bytes)
+            asdu = ASDU.decode_from_bytes(view[6:2+length], decode_mode)
         
         return APDU(apci, asdu), 2 + length
     
+    @staticmethod
+    def skip_to_start(buf: bytearray):
+        """
+        Resync a receive buffer after a bad frame header
+        
+        Discards bytes up to the next candidate 0x68 start byte (or all
+        of them) with one scan, instead of dropping one byte per retry.
+        """
+        idx = buf.find(0x68, 1)
+        del buf[:idx if idx >= 0 else len(buf)]
+    
     @staticmethod
     def create_startdt_act() -> 'APDU':
         """Create STARTDT activation frame"""
@@ -362,15 +491,46 @@ class APDU:
         """Create I frame with data"""
         return APDU(APCI(APDUType.I_FRAME, send_seq, recv_seq), asdu)
     
+    @staticmethod
+    def encode_data(send_seq: int, recv_seq: int, asdu_bytes: bytes) -> bytes:
+        """
+        Encode I frame around an already encoded ASDU
+        
+        Lets one ASDU encoding be shared by many connections; only the
+        6 byte header with the per-connection sequence numbers differs.
+        """
+        return _I_FRAME_HEADER_STRUCT.pack(
+            0x68, len(asdu_bytes) + 4,
+            (send_seq << 1) & 0xFFFF, (recv_seq << 1) & 0xFFFF) + asdu_bytes
+    
     @staticmethod
     def create_supervisory(recv_seq: int) -> 'APDU':
         """Create S frame (flow control)"""
         return APDU(APCI(APDUType.S_FRAME, 0, recv_seq))
+    
+    @staticmethod
+    def encode_supervisory(recv_seq: int) -> bytes:
+        """
+        Encode S frame directly, without building APDU/APCI objects
+        
+        The S frame is a fixed 6 byte layout: 68 04 01 00 + RSN << 1.
+        """
+        return _I_FRAME_HEADER_STRUCT.pack(0x68, 0x04, 0x0001,
+                                           (recv_seq << 1) & 0xFFFF)
 
 
-# Add decode method to ASDU
-def asdu_decode_from_bytes(data: bytes) -> ASDU:
-    """Decode ASDU from bytes"""
+# Packed (unaligned) record layouts for raw SoA decoding, keyed by type ID.
+# Types not listed carry the 3-byte IOA only.
+_IOA_FIELDS = [('ioa_lo', '<u2'), ('ioa_hi', 'u1')]
+_SOA_DTYPES = {
+    TypeID.M_SP_NA_1: np.dtype(_IOA_FIELDS + [('siq', 'u1')]),
+    TypeID.M_ME_NC_1: np.dtype(_IOA_FIELDS + [('value', '<f4'), ('quality', 'u1')]),
+}
+_SOA_DEFAULT_DTYPE = np.dtype(_IOA_FIELDS)
+
+
+def _decode_header(data: memoryview) -> Tuple[TypeID, int, CauseOfTransmission, int, int]:
+    """Decode the 6 byte ASDU header"""
     if len(data) < 6:
         raise ValueError("ASDU too short")
     
@@ -379,10 +539,16 @@ def asdu_decode_from_bytes(data: bytes) -> ASDU:
     num_objects = vsq & 0x7F
     cot_byte = data[2]
     originator = data[3]
-    common_address = data[4] | (data[5] << 8)
+    common_address = int.from_bytes(data[4:6], 'little')
     
     cause = CauseOfTransmission(cot_byte & 0x3F)
     
+    return type_id, num_objects, cause, originator, common_address
+
+
+def _decode_objects(type_id: TypeID, cause: CauseOfTransmission,
+                    data: memoryview, num_objects: int) -> List[ObjectAddress]:
+    """Decode information objects into ObjectAddress instances"""
     objects = []
     pos = 6
     
@@ -390,7 +556,7 @@ def asdu_decode_from_bytes(data: bytes) -> ASDU:
     for i in range(num_objects):
         if pos + 3 > len(data):
             break
-        ioa = data[pos] | (data[pos+1] << 8) | (data[pos+2] << 16)
+        ioa = int.from_bytes(data[pos:pos+3], 'little')
         pos += 3
         
         # Decode value based on type ID
@@ -403,13 +569,63 @@ def asdu_decode_from_bytes(data: bytes) -> ASDU:
             pos += 1
             
         elif type_id == TypeID.M_ME_NC_1 and pos + 4 < len(data):
-            value = struct.unpack('<f', data[pos:pos+4])[0]
+            value, = _FLOAT_STRUCT.unpack_from(data, pos)
             quality = data[pos+4]
             pos += 5
         
         obj = ObjectAddress(ioa, type_id, cause, value, quality)
         objects.append(obj)
     
+    return objects
+
+
+def _decode_objects_soa(type_id: TypeID, data: memoryview,
+                        num_objects: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Decode information objects as (ioa, value, quality) numpy arrays
+    
+    Only complete objects are decoded; a truncated trailing object is dropped.
+    """
+    dtype = _SOA_DTYPES.get(type_id, _SOA_DEFAULT_DTYPE)
+    count = min(num_objects, (len(data) - 6) // dtype.itemsize)
+    records = np.frombuffer(data, dtype=dtype, count=count, offset=6)
+    
+    ioas = records['ioa_lo'].astype(np.uint32) | (records['ioa_hi'].astype(np.uint32) << 16)
+    
+    if type_id == TypeID.M_SP_NA_1:
+        values = (records['siq'] & 0x01).astype(np.float64)
+        qualities = records['siq'] & 0xF0
+    elif type_id == TypeID.M_ME_NC_1:
+        values = records['value'].astype(np.float64)
+        qualities = records['quality'].copy()
+    else:
+        values = np.zeros(count, dtype=np.float64)
+        qualities = np.zeros(count, dtype=np.uint8)
+    
+    return ioas, values, qualities
+
+
+# Add decode method to ASDU
+def asdu_decode_from_bytes(data: memoryview, decode_mode: str = 'objects') -> ASDU:
+    """
+    Decode ASDU from bytes
+    
+    Args:
+        data: ASDU bytes (without APCI); any bytes-like object, a
+            memoryview slice avoids copying the payload
+        decode_mode: 'objects' builds ObjectAddress instances, 'raw' fills
+            ASDU.objects_soa with (ioa, value, quality) numpy arrays
+    """
+    if decode_mode not in ('objects', 'raw'):
+        raise ValueError(f"Unknown decode_mode: {decode_mode!r}")
+    
+    type_id, num_objects, cause, originator, common_address = _decode_header(data)
+    
+    if decode_mode == 'raw':
+        soa = _decode_objects_soa(type_id, data, num_objects)
+        return ASDU(type_id, cause, originator, common_address, objects_soa=soa)
+    
+    objects = _decode_objects(type_id, cause, data, num_objects)
     return ASDU(type_id, cause, originator, common_address, objects)
 
 ASDU.decode_from_bytes = staticmethod(asdu_decode_from_bytes)
@@ -25,7 +25,8 @@ Standard IEC 104 port: 2404/TCP
 
 import asyncio
 import logging
-from typing import Dict, List, Optional, Set
+import socket
+from typing import Dict, Optional, Set
 from datetime import datetime
 from dataclasses import dataclass
 
@@ -38,8 +39,19 @@ from protocols.iec104.connection import ConnectionStateMachine, ConnectionState
 
 logger = logging.getLogger(__name__)
 
+# U frames carry no sequence numbers, so their encodings never change
+_STARTDT_CON_BYTES = APDU.create_startdt_con().encode()
+_STOPDT_CON_BYTES = APDU.create_stopdt_con().encode()
+_TESTFR_ACT_BYTES = APDU.create_testfr_act().encode()
+_TESTFR_CON_BYTES = APDU.create_testfr_con().encode()
 
-@dataclass
+# Frame types compared on every received APDU
+_U_FRAME = APDUType.U_FRAME
+_I_FRAME = APDUType.I_FRAME
+_S_FRAME = APDUType.S_FRAME
+
+
+@dataclass(slots=True)
 class IEC104Measurement:
     """Single IEC 104 measurement point"""
     information_object_address: int
@@ -79,20 +91,44 @@ class IEC104Server:
         # Server state
         self.server = None
         self.running = False
-        self.connections: Dict[str, ConnectionStateMachine] = {}
-        self.connection_handlers: Dict[str, asyncio.Task] = {}
+        # Keyed by connection object (identity), not a formatted address
+        self.connections: Set[ConnectionStateMachine] = set()
+        self.connection_handlers: Dict[ConnectionStateMachine, asyncio.Task] = {}
         
         # Data management
         self.measurements: Dict[int, IEC104Measurement] = {}
         self.control_callbacks: Dict[int, callable] = {}
+        # Encoded interrogation response ASDU, rebuilt only after a
+        # measurement changes (None = stale)
+        self._interrogation_asdu: Optional[bytes] = None
         
         # Configuration
         self.idle_timeout_s = 120
         self.keep_alive_s = 30
         self.max_clients = 5
+        self.accept_wait_s = 5  # Max wait for a free slot before refusing
+        self.rx_chunk_size = 65536  # Large reads: fewer recv calls per burst
+        self._accept_sem: Optional[asyncio.BoundedSemaphore] = None
+        
+        # Frame dispatch tables: one dict lookup per frame instead of an
+        # if/elif chain over function codes and type IDs
+        self._u_handlers = {
+            UFrameFunction.STARTDT_ACT: self._on_startdt_act,
+            UFrameFunction.STOPDT_ACT: self._on_stopdt_act,
+            UFrameFunction.TESTFR_ACT: self._on_testfr_act,
+            UFrameFunction.TESTFR_CON: self._on_testfr_con,
+        }
+        self._asdu_handlers = {
+            TypeID.C_IC_NA_1: self._on_interrogation,
+            TypeID.C_SC_NA_1: self._on_control_command,  # Single (on/off)
+            TypeID.C_DC_NA_1: self._on_control_command,  # Double (raise/lower)
+        }
     
     async def start(self):
         """Start IEC 104 TCP server"""
+        # One slot per allowed master; extra connections wait for a slot
+        self._accept_sem = asyncio.BoundedSemaphore(self.max_clients)
+        
         try:
             self.server = await asyncio.start_server(
                 self._handle_client,
@@ -103,9 +139,6 @@ class IEC104Server:
             addr = self.server.sockets[0].getsockname()
             self.logger.info(f"IEC 104 server started on {addr[0]}:{addr[1]}")
             
-            # Start keep-alive monitor task
-            asyncio.create_task(self._monitor_connections())
-            
         except Exception as e:
             self.logger.error(f"Failed to start IEC 104 server: {e}")
             raise
@@ -115,7 +148,7 @@ class IEC104Server:
         self.running = False
         
         # Close all client connections
-        for addr, conn in list(self.connections.items()):
+        for conn in list(self.connections):
             conn.disconnect()
         
         # Cancel all handlers
@@ -135,42 +168,62 @@ class IEC104Server:
         """
         Handle new client connection
         
-        This coroutine manages a single client from connection to disconnection.
+        Sessions are gated by a semaphore sized to max_clients: a connection
+        beyond the limit is held until a slot frees, for at most
+        accept_wait_s, and is then closed.
         """
         addr = writer.get_extra_info('peername')
         addr_str = f"{addr[0]}:{addr[1]}"
         
-        # Check max connections
-        if len(self.connections) >= self.max_clients:
-            self.logger.warning(f"Connection rejected from {addr_str}: max clients reached")
-            writer.close()
-            await writer.wait_closed()
+        if self._accept_sem.locked():
+            self.logger.warning(f"Client {addr_str} waiting: max clients reached")
+        
+        try:
+            await asyncio.wait_for(self._accept_sem.acquire(),
+                                   timeout=self.accept_wait_s)
+        except asyncio.TimeoutError:
+            self.logger.warning(f"Client {addr_str} rejected: max clients reached")
+            writer.transport.abort()
             return
         
+        try:
+            await self._serve_client(reader, writer, addr_str)
+        finally:
+            self._accept_sem.release()
+    
+    async def _serve_client(self, reader: asyncio.StreamReader,
+                            writer: asyncio.StreamWriter, addr_str: str):
+        """
+        Serve a single client session
+        
+        This coroutine manages a single client from connection to disconnection.
+        """
         self.logger.info(f"Client connected: {addr_str}")
         
+        # Small control frames are latency sensitive - disable Nagle
+        sock = writer.get_extra_info('socket')
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        
         # Create connection state machine
-        conn = ConnectionStateMachine(addr_str)
+        conn = ConnectionStateMachine(addr_str, writer=writer)
         conn.on_connected()
-        self.connections[addr_str] = conn
+        conn.arm_idle_timer(self.idle_timeout_s, self._on_idle_timeout)
+        self.connections.add(conn)
+        self.connection_handlers[conn] = asyncio.create_task(
+            self._drain_writer(conn))
         
         try:
             while self.running and conn.is_connected():
-                # Check timeout
-                if conn.check_timeout(self.idle_timeout_s):
-                    self.logger.warning(f"Client {addr_str} timeout")
-                    break
-                
                 # Check keep-alive
                 if conn.need_testfr():
-                    testfr = APDU.create_testfr_act()
-                    self._send_apdu(writer, testfr, conn)
+                    self._send_frame(_TESTFR_ACT_BYTES, conn)
                 
                 # Try to receive data
                 try:
                     # With timeout for keep-alive check
                     data = await asyncio.wait_for(
-                        reader.read(1024), 
+                        reader.read(self.rx_chunk_size),
                         timeout=self.keep_alive_s
                     )
                     
@@ -179,7 +232,8 @@ class IEC104Server:
                         break
                     
                     # Process received data
-                    await self._process_client_data(data, writer, conn)
+                    conn.on_data_received()
+                    await self._process_client_data(data, conn)
                     
                 except asyncio.TimeoutError:
                     # No data received - that's OK, check keep-alive
@@ -193,8 +247,10 @@ class IEC104Server:
             # Cleanup
             self.logger.info(f"Client disconnected: {addr_str}")
             conn.disconnect()
-            if addr_str in self.connections:
-                del self.connections[addr_str]
+            self.connections.discard(conn)
+            drain_task = self.connection_handlers.pop(conn, None)
+            if drain_task:
+                drain_task.cancel()
             
             try:
                 writer.close()
@@ -202,119 +258,150 @@ class IEC104Server:
             except:
                 pass
     
-    async def _process_client_data(self, data: bytes, 
-                                  writer: asyncio.StreamWriter,
+    async def _process_client_data(self, data: bytes,
                                   conn: ConnectionStateMachine):
         """Process received data from client"""
-        conn.rx_buffer.extend(data)
+        buf = conn.rx_buffer
+        buf.extend(data)
         
         # Process complete APDUs from buffer
-        while len(conn.rx_buffer) >= 6:
+        while len(buf) >= 6:
+            # Length-prefix fast path: validate the 2 byte header and wait
+            # for the whole frame before attempting a decode. Length octet
+            # is 4 (APCI only) to 253, so the whole APDU is 6-255 bytes.
+            need = buf[1] + 2
+            if buf[0] != 0x68 or need < 6 or need > 255:
+                self.logger.warning(f"Invalid APDU header from {conn.remote_address}: "
+                                    f"0x{buf[0]:02x} 0x{buf[1]:02x}")
+                APDU.skip_to_start(buf)
+                continue
+            
+            if len(buf) < need:
+                # Incomplete frame - wait for more data
+                break
+            
             try:
-                apdu, consumed = APDU.decode(bytes(conn.rx_buffer))
-                conn.rx_buffer = conn.rx_buffer[consumed:]
-                
-                # Handle APDU
-                await self._handle_apdu(apdu, writer, conn)
-                
+                # Decode through a memoryview of exactly one frame, no copy
+                apdu, _ = APDU.decode(memoryview(buf)[:need])
             except ValueError as e:
-                # Invalid APDU - try to resync
+                # Framing is valid, only the content is bad: drop exactly
+                # this frame rather than scanning its payload for 0x68
                 self.logger.warning(f"Invalid APDU from {conn.remote_address}: {e}")
-                # Skip one byte and try again
-                conn.rx_buffer.pop(0)
+                apdu = None
+            
+            del buf[:need]
+            if apdu is None:
+                continue
+            
+            # Handle APDU
+            await self._handle_apdu(apdu, conn)
     
-    async def _handle_apdu(self, apdu: APDU, writer: asyncio.StreamWriter,
-                          conn: ConnectionStateMachine):
-        """Handle received APDU from client"""
+    async def _handle_apdu(self, apdu: APDU, conn: ConnectionStateMachine):
+        """
+        Handle received APDU from client
+        
+        All responses to one APDU (e.g. interrogation data plus the S frame
+        ACK) are collected in one buffer and queued as a single write; the
+        ACK is encoded into it with APDU.encode_into, pre-encoded frames
+        (U frame confirmations, the cached interrogation ASDU) are copied.
+        """
+        out = bytearray()
+        apci = apdu.apci
+        frame_type = apci.frame_type
         
         # Handle based on APDU type
-        if apdu.apci.frame_type == APDUType.U_FRAME:
+        if frame_type is _U_FRAME:
             # Unnumbered frame (connection control)
-            u_func = apdu.apci.u_function
-            
-            if u_func == UFrameFunction.STARTDT_ACT:
-                # Client requests data transfer start
-                if conn.on_startdt_act():
-                    response = APDU.create_startdt_con()
-                    self._send_apdu(writer, response, conn)
-                    self.logger.info(f"Client {conn.remote_address} started data transfer")
-            
-            elif u_func == UFrameFunction.STOPDT_ACT:
-                # Client requests data transfer stop
-                if conn.on_stopdt_act():
-                    response = APDU.create_stopdt_con()
-                    self._send_apdu(writer, response, conn)
-                    self.logger.info(f"Client {conn.remote_address} stopped data transfer")
-            
-            elif u_func == UFrameFunction.TESTFR_ACT:
-                # Echo TESTFR
-                conn.on_testfr_act()
-                response = APDU.create_testfr_con()
-                self._send_apdu(writer, response, conn)
-            
-            elif u_func == UFrameFunction.TESTFR_CON:
-                # Response to our TESTFR
-                conn.on_testfr_con()
+            handler = self._u_handlers.get(apci.u_function)
+            if handler:
+                handler(conn, out)
         
-        elif apdu.apci.frame_type == APDUType.I_FRAME:
+        elif frame_type is _I_FRAME:
             # Information frame (data/commands)
             
             # Update sequence numbers
-            conn.on_recv_sequence_received(apdu.apci.send_sequence)
+            conn.on_recv_sequence_received(apci.send_sequence)
             
             # Process ASDU
             if apdu.asdu:
-                await self._handle_asdu(apdu.asdu, writer, conn)
+                handler = self._asdu_handlers.get(apdu.asdu.type_id)
+                if handler:
+                    await handler(apdu.asdu, conn, out)
             
-            # Send supervisory frame to acknowledge
-            sup = APDU.create_supervisory(conn.next_recv_sequence())
-            self._send_apdu(writer, sup, conn)
+            # Send supervisory frame to acknowledge, encoded straight into
+            # the output buffer
+            self._append_apdu(
+                out, APDU.create_supervisory(conn.next_recv_sequence()), conn)
         
-        elif apdu.apci.frame_type == APDUType.S_FRAME:
+        elif frame_type is _S_FRAME:
             # Supervisory frame (flow control) - just update sequence
-            conn.on_recv_sequence_received(apdu.apci.receive_sequence)
+            conn.on_recv_sequence_received(apci.receive_sequence)
+        
+        if out:
+            self._enqueue(bytes(out), conn)
     
-    async def _handle_asdu(self, asdu: ASDU, writer: asyncio.StreamWriter,
-                          conn: ConnectionStateMachine):
-        """Handle received ASDU from client"""
-        
-        # Handle based on type ID
-        if asdu.type_id == TypeID.C_IC_NA_1:
-            # Interrogation command - send all measurements
-            self.logger.info(f"Interrogation from {conn.remote_address}")
-            
-            # Create response ASDU with all measurements
+    def _on_startdt_act(self, conn: ConnectionStateMachine, out: bytearray):
+        """Client requests data transfer start"""
+        if conn.on_startdt_act():
+            self._append_frame(out, _STARTDT_CON_BYTES, conn)
+            self.logger.info(f"Client {conn.remote_address} started data transfer")
+    
+    def _on_stopdt_act(self, conn: ConnectionStateMachine, out: bytearray):
+        """Client requests data transfer stop"""
+        if conn.on_stopdt_act():
+            self._append_frame(out, _STOPDT_CON_BYTES, conn)
+            self.logger.info(f"Client {conn.remote_address} stopped data transfer")
+    
+    def _on_testfr_act(self, conn: ConnectionStateMachine, out: bytearray):
+        """Echo TESTFR"""
+        conn.on_testfr_act()
+        self._append_frame(out, _TESTFR_CON_BYTES, conn)
+    
+    def _on_testfr_con(self, conn: ConnectionStateMachine, out: bytearray):
+        """Response to our TESTFR"""
+        conn.on_testfr_con()
+    
+    async def _on_interrogation(self, asdu: ASDU, conn: ConnectionStateMachine,
+                                out: bytearray):
+        """Interrogation command - send all measurements"""
+        self.logger.info(f"Interrogation from {conn.remote_address}")
+        
+        if not self.measurements:
+            return
+        
+        # Response ASDU with all measurements; the snapshot is the same for
+        # every master, so it is encoded once and only the I frame header
+        # with this connection's sequence numbers is built per response
+        asdu_bytes = self._interrogation_asdu
+        if asdu_bytes is None:
             objects = [
                 ObjectAddress(m.information_object_address, m.type_id,
                             CauseOfTransmission.INTERROGATION_CONF,
                             m.value, m.quality)
                 for m in self.measurements.values()
             ]
-            
-            if objects:
-                response_asdu = ASDU(
-                    TypeID.C_IC_NA_1,
-                    CauseOfTransmission.INTERROGATION_CONF,
-                    objects=objects
-                )
-                response = APDU.create_data(
-                    conn.next_send_sequence(),
-                    conn.next_recv_sequence(),
-                    response_asdu
-                )
-                self._send_apdu(writer, response, conn)
-        
-        elif asdu.type_id == TypeID.C_SC_NA_1:
-            # Single command (on/off)
-            for obj in asdu.objects:
-                await self._execute_control(obj.information_object_address,
-                                           obj.value, conn)
-        
-        elif asdu.type_id == TypeID.C_DC_NA_1:
-            # Double command (raise/lower)
-            for obj in asdu.objects:
-                await self._execute_control(obj.information_object_address,
-                                           obj.value, conn)
+            asdu_bytes = self._interrogation_asdu = ASDU(
+                TypeID.C_IC_NA_1,
+                CauseOfTransmission.INTERROGATION_CONF,
+                objects=objects
+            ).encode()
+        
+        try:
+            frame = APDU.encode_data(conn.next_send_sequence(),
+                                     conn.next_recv_sequence(), asdu_bytes)
+        except Exception as e:
+            self.logger.error(f"Failed to send APDU to {conn.remote_address}: {e}")
+            return
+        
+        self._append_frame(out, frame, conn)
+    
+    async def _on_control_command(self, asdu: ASDU,
+                                  conn: ConnectionStateMachine,
+                                  out: bytearray):
+        """Single/double command - run the registered control callbacks"""
+        for obj in asdu.objects:
+            await self._execute_control(obj.information_object_address,
+                                       obj.value, conn)
     
     async def _execute_control(self, ioa: int, value: float,
                               conn: ConnectionStateMachine):
@@ -330,15 +417,82 @@ class IEC104Server:
             except Exception as e:
                 self.logger.error(f"Control execution error: {e}")
     
-    def _send_apdu(self, writer: asyncio.StreamWriter, apdu: APDU,
-                  conn: ConnectionStateMachine):
-        """Send APDU to client"""
+    def _append_apdu(self, out: bytearray, apdu: APDU,
+                     conn: ConnectionStateMachine):
+        """Encode APDU onto the end of a pending output buffer"""
+        start = len(out)
         try:
-            data = apdu.encode()
-            writer.write(data)
-            conn.on_data_sent()
+            apdu.encode_into(out, start)
         except Exception as e:
+            del out[start:]  # Drop any partially encoded frame
             self.logger.error(f"Failed to send APDU to {conn.remote_address}: {e}")
+            return
+        
+        conn.on_data_sent()
+    
+    @staticmethod
+    def _append_frame(out: bytearray, data: bytes,
+                      conn: ConnectionStateMachine):
+        """Append pre-encoded frame bytes to a pending output buffer"""
+        out += data
+        conn.on_data_sent()
+    
+    def _send_frame(self, data: bytes, conn: ConnectionStateMachine):
+        """Queue encoded frame bytes for the client's writer task"""
+        # The sequence number is consumed and the frame queued with no
+        # await in between, so frames reach the writer in N(S) order
+        if self._enqueue(data, conn):
+            conn.on_data_sent()
+    
+    def _enqueue(self, data: bytes, conn: ConnectionStateMachine) -> bool:
+        """
+        Queue bytes for the client's writer task without waiting
+        
+        A client whose queue is full has stopped reading; it is dropped
+        rather than letting it stall broadcasts to every other master.
+        """
+        try:
+            conn.tx_queue.put_nowait(data)
+        except asyncio.QueueFull:
+            self._abort_connection(conn, "transmit queue full, client not reading")
+            return False
+        return True
+    
+    def _abort_connection(self, conn: ConnectionStateMachine, reason: str):
+        """
+        Drop a client immediately, discarding unsent data
+        
+        Aborting the transport wakes the client's read loop with EOF, which
+        then runs the normal disconnect cleanup.
+        """
+        if conn.state == ConnectionState.ERROR:
+            return  # Already aborted
+        
+        conn.on_error(reason)
+        if conn.writer is not None:
+            conn.writer.transport.abort()
+    
+    async def _drain_writer(self, conn: ConnectionStateMachine):
+        """
+        Per-client writer task
+        
+        The only coroutine that writes to the client's socket, so queued
+        frames go out in sequence order without a task per send. Ends only
+        by cancellation (session cleanup) or a write failure, which aborts
+        the session: nothing else would drain the queue.
+        """
+        queue = conn.tx_queue
+        try:
+            while True:
+                # Take everything already queued and hand it to the
+                # transport in one writelines() call and one drain()
+                frames = [await queue.get()]
+                while not queue.empty():
+                    frames.append(queue.get_nowait())
+                conn.writer.writelines(frames)
+                await conn.writer.drain()
+        except Exception as e:
+            self._abort_connection(conn, f"write failed: {e}")
     
     async def send_measurement(self, information_object_address: int,
                              value: float, type_id: TypeID = TypeID.M_ME_NC_1,
@@ -352,28 +506,37 @@ class IEC104Server:
             type_id: IEC 104 data type (default M_ME_NC_1 = float)
             quality: Quality flags (0x00=good, 0x01=overflow, etc.)
         """
-        # Store in database
-        measurement = IEC104Measurement(information_object_address, type_id,
-                                       value, quality)
-        self.measurements[information_object_address] = measurement
+        # Store in database; repeated updates of a point reuse its record
+        measurement = self.measurements.get(information_object_address)
+        if measurement is None:
+            self.measurements[information_object_address] = IEC104Measurement(
+                information_object_address, type_id, value, quality)
+        else:
+            measurement.type_id = type_id
+            measurement.value = value
+            measurement.quality = quality
+        self._interrogation_asdu = None
         
-        # Send to all active clients
-        for addr, conn in list(self.connections.items()):
+        # The spontaneous ASDU is identical for every master: encode it once
+        # and only build the sequence-numbered header per client
+        try:
+            obj = ObjectAddress(information_object_address, type_id,
+                              CauseOfTransmission.SPONTANEOUS,
+                              value, quality)
+            asdu_bytes = ASDU(type_id, CauseOfTransmission.SPONTANEOUS,
+                              objects=[obj]).encode()
+        except Exception as e:
+            self.logger.error(f"Failed to send measurement: {e}")
+            return
+        
+        # Queue to all active clients; each client's writer task sends it
+        for conn in list(self.connections):
             if not conn.is_active():
                 continue
             
-            try:
-                obj = ObjectAddress(information_object_address, type_id,
-                                  CauseOfTransmission.SPONTANEOUS,
-                                  value, quality)
-                asdu = ASDU(type_id, CauseOfTransmission.SPONTANEOUS,
-                          objects=[obj])
-                
-                # Would need writer reference - stub for now
-                # In full implementation, keep writers in connection
-                
-            except Exception as e:
-                self.logger.error(f"Failed to send measurement: {e}")
+            data = APDU.encode_data(conn.next_send_sequence(),
+                                    conn.next_recv_sequence(), asdu_bytes)
+            self._send_frame(data, conn)
     
     def register_control_callback(self, information_object_address: int,
                                  callback: callable):
@@ -384,19 +547,15 @@ class IEC104Server:
         """
         self.control_callbacks[information_object_address] = callback
     
-    async def _monitor_connections(self):
-        """Monitor all connections for timeouts"""
-        while self.running:
-            try:
-                await asyncio.sleep(30)  # Check every 30 seconds
-                
-                for addr, conn in list(self.connections.items()):
-                    if conn.check_timeout(self.idle_timeout_s):
-                        self.logger.warning(f"Timeout on connection {addr}")
-                        # Connection will be closed by main handler
-            
-            except Exception as e:
-                self.logger.error(f"Monitor error: {e}")
+    def _on_idle_timeout(self, conn: ConnectionStateMachine):
+        """Idle timer callback: close a connection with no receive activity"""
+        self.logger.warning(f"Client {conn.remote_address} timeout")
+        conn.state = ConnectionState.TIMEOUT
+        # Abort rather than close: close() waits to flush, which never
+        # happens for a stalled peer. Abort wakes the client's read loop
+        # with EOF, which then runs the normal disconnect cleanup.
+        if conn.writer is not None:
+            conn.writer.transport.abort()
     
     def get_status(self) -> dict:
         """Get server status"""
@@ -406,12 +565,12 @@ class IEC104Server:
             'measurements': len(self.measurements),
             'clients': [
                 {
-                    'address': addr,
+                    'address': conn.remote_address,
                     'state': conn.state.name,
                     'send_seq': conn.send_sequence,
                     'recv_seq': conn.recv_sequence,
                 }
-                for addr, conn in self.connections.items()
+                for conn in self.connections
             ]
         }
     
@@ -34,6 +34,10 @@ from protocols.modbus.register_map import (
     decode_power_mw,
     decode_frequency_hz,
     decode_temperature_celsius,
+    encode_register,
+    decode_register,
+    encode_block,
+    get_scale_vector,
 )
 from protocols.modbus.data_quality import DataQualityManager, DataQuality
 
@@ -54,6 +58,9 @@ __all__ = [
     'encode_power_mw',
     'encode_frequency_hz',
     'encode_temperature_celsius',
+    'encode_register',
+    'encode_block',
+    'get_scale_vector',
     
     # Decoding functions
     'decode_voltage_kv',
@@ -61,6 +68,7 @@ __all__ = [
     'decode_power_mw',
     'decode_frequency_hz',
     'decode_temperature_celsius',
+    'decode_register',
     
     # Data quality
     'DataQualityManager',
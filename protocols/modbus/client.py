@@ -7,21 +7,65 @@ Wrapper around Modbus TCP protocol for SCADA master communication.
 Features:
     - Connection management
     - Automatic reconnect on failure
-    - Read/write operations (FC03/04, FC05/06)
+    - Read/write operations (FC03/04, FC05/06, FC16, FC23)
+    - Batched reads coalescing adjacent register ranges into one FC03
     - Exception handling
     - Timeout management
+    - AsyncModbusClient: asyncio variant pipelining requests by transaction ID,
+      so one event loop can poll many RTUs without a thread per device
+    - ModbusMaster: concurrent polling cycles across many RTUs
 """
 
+import asyncio
 import socket
 import struct
+import sys
 import logging
 from typing import List, Optional, Dict, Tuple
-from datetime import datetime, timedelta
 import time
 
 
 logger = logging.getLogger(__name__)
 
+# Modbus spec limits per request
+MAX_READ_REGISTERS = 125   # FC03/04
+MAX_WRITE_REGISTERS = 123  # FC16
+MAX_READ_WRITE_REGISTERS = 121  # FC23 write part
+
+# Largest Modbus TCP ADU (7-byte MBAP header + 253-byte PDU)
+MAX_ADU_SIZE = 260
+
+# TCP keepalive probing so dead RTUs are detected on idle connections
+KEEPALIVE_IDLE_S = 10
+KEEPALIVE_INTERVAL_S = 5
+KEEPALIVE_COUNT = 3
+
+# SO_BUSY_POLL is Linux-only and not exported by the socket module
+SO_BUSY_POLL = getattr(socket, 'SO_BUSY_POLL', 46) if sys.platform.startswith('linux') else None
+
+# A connection with no response for this long is reported unhealthy
+RX_HEALTH_TIMEOUT_S = 10.0
+
+# Response timeouts tolerated in a row before the connection is dropped
+MAX_CONSECUTIVE_TIMEOUTS = 3
+
+# MBAP prefix: transaction ID, protocol ID, length of the rest of the ADU
+_MBAP_PREFIX_STRUCT = struct.Struct('>HHH')
+
+# Complete 12-byte request frames: MBAP header (transaction, protocol,
+# length, unit) + function code + address + count/value
+_REQUEST_STRUCT = struct.Struct('>HHHBBHH')
+# FC16 request up to the byte count; the register block follows
+_WRITE_MULTIPLE_HEADER_STRUCT = struct.Struct('>HHHBBHHB')
+# FC23 request up to the write byte count; the register block follows
+_READ_WRITE_HEADER_STRUCT = struct.Struct('>HHHBBHHHHB')
+
+# Big-endian register block (un)packers, indexed by register count
+_REGISTER_STRUCTS = [struct.Struct(f'>{n}H') for n in range(MAX_READ_REGISTERS + 1)]
+
+# Coil states of one response byte, LSB (lowest address) first
+_COIL_BITS = [tuple(bool((b >> i) & 1) for i in range(8)) for b in range(256)]
+
 
 class ModbusClient:
     """
@@ -29,10 +73,14 @@ class ModbusClient:
     
     Implements Modbus protocol framing:
     - MBAP (Modbus Application Protocol) header
-    - Function codes: FC03 (read holding), FC04 (read input), FC05 (write coil), FC06 (write register)
+    - Function codes: FC03 (read holding), FC04 (read input), FC05 (write coil),
+      FC06 (write register), FC16 (write multiple registers),
+      FC23 (read/write multiple registers)
     """
     
-    def __init__(self, host: str, port: int = 502, timeout_s: float = 2.0):
+    def __init__(self, host: str, port: int = 502, timeout_s: float = 2.0,
+                 coalesce_reads: bool = True, quickack: bool = False,
+                 socket_buffer_size: Optional[int] = 8192, busy_poll_us: int = 0):
         """
         Initialize Modbus client.
         
@@ -40,15 +88,35 @@ class ModbusClient:
             host: RTU IP address or hostname
             port: Modbus TCP port (default 502)
             timeout_s: Socket timeout in seconds
+            coalesce_reads: Merge adjacent ranges in batched reads; disable for
+                strict RTUs that reject reads spanning unmapped registers
+            quickack: Re-arm TCP_QUICKACK after every receive (Linux only)
+            socket_buffer_size: SO_SNDBUF/SO_RCVBUF size, None for OS default
+            busy_poll_us: SO_BUSY_POLL window for receives (Linux, needs
+                CAP_NET_ADMIN; ignored when unavailable), 0 to disable
         """
         self.host = host
         self.port = port
         self.timeout_s = timeout_s
+        self.coalesce_reads = coalesce_reads
+        self.quickack = quickack and hasattr(socket, 'TCP_QUICKACK')
+        self.socket_buffer_size = socket_buffer_size
+        self.busy_poll_us = busy_poll_us
         self.socket: Optional[socket.socket] = None
         self.transaction_id = 0
         self.connected = False
+        self._consecutive_timeouts = 0
+        self._rx_mid_frame = False  # Part of an ADU has been consumed
         self.last_error: Optional[str] = None
-        self.last_rx_time: datetime = datetime.now()
+        self.last_rx_monotonic: float = time.monotonic()
+        
+        # Reusable receive buffer holding one ADU at a time
+        self._rx_buf = bytearray(MAX_ADU_SIZE)
+        self._rx_mv = memoryview(self._rx_buf)
+        
+        # Reusable 12-byte request frame for FC01-06; a client is used from
+        # one thread at a time, so requests never overlap
+        self._tx_buf = bytearray(_REQUEST_STRUCT.size)
         
         # Connection statistics
         self.stats = {
@@ -68,7 +136,35 @@ class ModbusClient:
         """
         try:
             self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self._rx_mid_frame = False
             self.socket.settimeout(self.timeout_s)
+            
+            # Requests are tiny and each waits for its response, so Nagle
+            # would only delay them
+            self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            if self.socket_buffer_size:
+                self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF,
+                                       self.socket_buffer_size)
+                self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF,
+                                       self.socket_buffer_size)
+            
+            if self.busy_poll_us and SO_BUSY_POLL is not None:
+                try:
+                    self.socket.setsockopt(socket.SOL_SOCKET, SO_BUSY_POLL,
+                                           self.busy_poll_us)
+                except OSError as e:
+                    logger.debug(f"SO_BUSY_POLL not enabled for {self.host}: {e}")
+            
+            # Let the OS detect a dead RTU instead of tearing the connection
+            # down on the first slow response
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            for option, value in (('TCP_KEEPIDLE', KEEPALIVE_IDLE_S),
+                                  ('TCP_KEEPINTVL', KEEPALIVE_INTERVAL_S),
+                                  ('TCP_KEEPCNT', KEEPALIVE_COUNT)):
+                if hasattr(socket, option):
+                    self.socket.setsockopt(socket.IPPROTO_TCP,
+                                           getattr(socket, option), value)
+            
             self.socket.connect((self.host, self.port))
             self.connected = True
             self.stats['connections'] += 1
@@ -92,6 +188,30 @@ class ModbusClient:
         self.stats['disconnections'] += 1
         logger.info(f"Modbus disconnected from {self.host}:{self.port}")
     
+    def _on_request_failed(self, error: Exception):
+        """
+        Decide whether the connection survives a failed request.
+        
+        A timeout before any byte of the response arrived keeps the socket
+        (a late response is discarded by its transaction ID) until
+        MAX_CONSECUTIVE_TIMEOUTS in a row. A timeout part way through an
+        ADU leaves the rest of it in the socket, which would desync MBAP
+        framing, so it closes the socket like any other error and the next
+        request reconnects.
+        """
+        if isinstance(error, socket.timeout) and not self._rx_mid_frame:
+            self._consecutive_timeouts += 1
+            if self._consecutive_timeouts < MAX_CONSECUTIVE_TIMEOUTS:
+                return
+        
+        self._consecutive_timeouts = 0
+        self.connected = False
+        if self.socket:
+            try:
+                self.socket.close()
+            except OSError:
+                pass
+    
     def _get_transaction_id(self) -> int:
         """Get next transaction ID (1-65535)."""
         self.transaction_id = (self.transaction_id % 65535) + 1
@@ -115,12 +235,11 @@ class ModbusClient:
         try:
             # Build request
             txn_id = self._get_transaction_id()
-            request = self._build_request(txn_id, fc=3, address=address, count=count)
+            request = self._pack_request(txn_id, fc=3, address=address, value=count)
             
             # Send and receive
             self.socket.sendall(request)
-            response = self.socket.recv(256)
-            self.last_rx_time = datetime.now()
+            response = self._recv_adu(txn_id)
             self.stats['reads'] += 1
             
             # Parse response
@@ -131,9 +250,96 @@ class ModbusClient:
             self.last_error = str(e)
             self.stats['errors'] += 1
             logger.error(f"Read failed for {self.host}: {e}")
-            self.connected = False
+            self._on_request_failed(e)
             return None
     
+    def read_holding_registers_raw(self, address: int, count: int = 1) -> Optional[memoryview]:
+        """
+        Read holding registers (FC03) without decoding them.
+        
+        For callers that only forward or log the register data, or unpack a
+        few values lazily with struct.unpack_from.
+        
+        Args:
+            address: Starting register address (0-65535)
+            count: Number of registers to read (1-125)
+        
+        Returns:
+            Big-endian register data as a view into the receive buffer, valid
+            only until the next request on this client; None on error
+        """
+        if not self.connected:
+            if not self.connect():
+                return None
+        
+        try:
+            txn_id = self._get_transaction_id()
+            request = self._pack_request(txn_id, fc=3, address=address, value=count)
+            
+            self.socket.sendall(request)
+            response = self._recv_adu(txn_id)
+            self.stats['reads'] += 1
+            
+            _, data = self._parse_read_response_raw(response)
+            return data
+        
+        except Exception as e:
+            self.last_error = str(e)
+            self.stats['errors'] += 1
+            logger.error(f"Read failed for {self.host}: {e}")
+            self._on_request_failed(e)
+            return None
+    
+    def read_holding_registers_batch(self, ranges: List[Tuple[int, int]],
+                                     gap_tolerance: int = 0
+                                     ) -> Optional[Dict[Tuple[int, int], List[int]]]:
+        """
+        Read several holding register ranges with as few FC03 requests as possible.
+        
+        Overlapping or adjacent ranges (or ranges at most gap_tolerance
+        registers apart) are merged into one request of up to 125 registers,
+        and the response is sliced back into the requested ranges.
+        
+        Args:
+            ranges: (address, count) pairs to read
+            gap_tolerance: Unrequested registers allowed between merged ranges
+        
+        Returns:
+            Dict of (address, count) -> register values, or None on error
+        """
+        results: Dict[Tuple[int, int], List[int]] = {}
+        
+        for start, span, members in self._coalesce_ranges(ranges, gap_tolerance):
+            values = self.read_holding_registers(start, span)
+            if values is None or len(values) < span:
+                return None
+            
+            for address, count in members:
+                offset = address - start
+                results[(address, count)] = values[offset:offset + count]
+        
+        return results
+    
+    def _coalesce_ranges(self, ranges: List[Tuple[int, int]],
+                         gap_tolerance: int) -> List[Tuple[int, int, List[Tuple[int, int]]]]:
+        """Group (address, count) ranges into (start, span, members) reads."""
+        batches = []
+        
+        for address, count in sorted(ranges):
+            if batches and self.coalesce_reads:
+                batch = batches[-1]
+                start, end = batch[0], batch[0] + batch[1]
+                new_end = max(end, address + count)
+                if (address <= end + gap_tolerance
+                        and new_end - start <= MAX_READ_REGISTERS):
+                    batch[1] = new_end - start
+                    batch[2].append((address, count))
+                    continue
+            
+            batches.append([address, count, [(address, count)]])
+        
+        return [tuple(batch) for batch in batches]
+    
     def read_input_registers(self, address: int, count: int = 1) -> Optional[List[int]]:
         """
         Read input registers (FC04).
@@ -151,11 +357,10 @@ class ModbusClient:
         
         try:
             txn_id = self._get_transaction_id()
-            request = self._build_request(txn_id, fc=4, address=address, count=count)
+            request = self._pack_request(txn_id, fc=4, address=address, value=count)
             
             self.socket.sendall(request)
-            response = self.socket.recv(256)
-            self.last_rx_time = datetime.now()
+            response = self._recv_adu(txn_id)
             self.stats['reads'] += 1
             
             values = self._parse_read_response(response)
@@ -165,7 +370,7 @@ class ModbusClient:
             self.last_error = str(e)
             self.stats['errors'] += 1
             logger.error(f"Read failed for {self.host}: {e}")
-            self.connected = False
+            self._on_request_failed(e)
             return None
     
     def read_coils(self, address: int, count: int = 1) -> Optional[List[bool]]:
@@ -185,29 +390,19 @@ class ModbusClient:
         
         try:
             txn_id = self._get_transaction_id()
-            request = self._build_request(txn_id, fc=1, address=address, count=count)
+            request = self._pack_request(txn_id, fc=1, address=address, value=count)
             
             self.socket.sendall(request)
-            response = self.socket.recv(256)
-            self.last_rx_time = datetime.now()
+            response = self._recv_adu(txn_id)
             self.stats['reads'] += 1
             
-            # Parse coil response
-            coils = []
-            if len(response) >= 9:
-                byte_count = response[8]
-                for i in range(count):
-                    byte_idx = 9 + (i // 8)
-                    bit_idx = i % 8
-                    if byte_idx < len(response):
-                        coils.append(bool((response[byte_idx] >> bit_idx) & 1))
-            return coils if coils else None
+            return self._parse_coil_response(response, count)
         
         except Exception as e:
             self.last_error = str(e)
             self.stats['errors'] += 1
             logger.error(f"Read coils failed for {self.host}: {e}")
-            self.connected = False
+            self._on_request_failed(e)
             return None
     
     def write_register(self, address: int, value: int) -> bool:
@@ -227,11 +422,10 @@ class ModbusClient:
         
         try:
             txn_id = self._get_transaction_id()
-            request = self._build_write_request(txn_id, fc=6, address=address, value=value)
+            request = self._pack_request(txn_id, fc=6, address=address, value=value)
             
             self.socket.sendall(request)
-            response = self.socket.recv(256)
-            self.last_rx_time = datetime.now()
+            response = self._recv_adu(txn_id)
             self.stats['writes'] += 1
             
             # Check for exception
@@ -245,9 +439,98 @@ class ModbusClient:
             self.last_error = str(e)
             self.stats['errors'] += 1
             logger.error(f"Write failed for {self.host}: {e}")
-            self.connected = False
+            self._on_request_failed(e)
             return False
     
+    def write_registers(self, address: int, values: List[int]) -> bool:
+        """
+        Write multiple registers (FC16).
+        
+        Args:
+            address: Starting register address
+            values: Values to write (1-123 registers, each 0-65535)
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        if not 1 <= len(values) <= MAX_WRITE_REGISTERS:
+            self.last_error = f"Invalid register count {len(values)}"
+            logger.error(f"Write failed for {self.host}: {self.last_error}")
+            return False
+        
+        if not self.connected:
+            if not self.connect():
+                return False
+        
+        try:
+            txn_id = self._get_transaction_id()
+            request = self._build_write_multiple_request(txn_id, address, values)
+            
+            self.socket.sendall(request)
+            response = self._recv_adu(txn_id)
+            self.stats['writes'] += 1
+            
+            # Check for exception
+            if len(response) > 7 and response[7] & 0x80:
+                exception_code = response[8]
+                raise Exception(f"Modbus exception {exception_code}")
+            
+            return True
+        
+        except Exception as e:
+            self.last_error = str(e)
+            self.stats['errors'] += 1
+            logger.error(f"Write failed for {self.host}: {e}")
+            self._on_request_failed(e)
+            return False
+    
+    def read_write_multiple_registers(self, read_address: int, read_count: int,
+                                      write_address: int,
+                                      values: List[int]) -> Optional[List[int]]:
+        """
+        Write registers and read registers in one request (FC23).
+        
+        The RTU performs the write before the read, so a setpoint and its
+        read-back take a single round trip.
+        
+        Args:
+            read_address: Starting address to read
+            read_count: Number of registers to read (1-125)
+            write_address: Starting address to write
+            values: Values to write (1-121 registers, each 0-65535)
+        
+        Returns:
+            List of read register values, or None on error
+        """
+        if (not 1 <= read_count <= MAX_READ_REGISTERS
+                or not 1 <= len(values) <= MAX_READ_WRITE_REGISTERS):
+            self.last_error = f"Invalid register count {read_count}/{len(values)}"
+            logger.error(f"Read/write failed for {self.host}: {self.last_error}")
+            return None
+        
+        if not self.connected:
+            if not self.connect():
+                return None
+        
+        try:
+            txn_id = self._get_transaction_id()
+            request = self._build_read_write_request(txn_id, read_address, read_count,
+                                                     write_address, values)
+            
+            self.socket.sendall(request)
+            response = self._recv_adu(txn_id)
+            self.stats['reads'] += 1
+            self.stats['writes'] += 1
+            
+            return self._parse_read_response(response)
+        
+        except Exception as e:
+            self.last_error = str(e)
+            self.stats['errors'] += 1
+            logger.error(f"Read/write failed for {self.host}: {e}")
+            self._on_request_failed(e)
+            return None
+    
     def write_coil(self, address: int, value: bool) -> bool:
         """
         Write single coil (FC05).
@@ -266,12 +549,11 @@ class ModbusClient:
         try:
             txn_id = self._get_transaction_id()
             payload_value = 0xFF00 if value else 0x0000
-            request = self._build_write_request(txn_id, fc=5, address=address, 
-                                               value=payload_value)
+            request = self._pack_request(txn_id, fc=5, address=address,
+                                         value=payload_value)
             
             self.socket.sendall(request)
-            response = self.socket.recv(256)
-            self.last_rx_time = datetime.now()
+            response = self._recv_adu(txn_id)
             self.stats['writes'] += 1
             
             # Check for exception
@@ -285,32 +567,87 @@ class ModbusClient:
             self.last_error = str(e)
             self.stats['errors'] += 1
             logger.error(f"Write coil failed for {self.host}: {e}")
-            self.connected = False
+            self._on_request_failed(e)
             return False
     
-    def _build_request(self, txn_id: int, fc: int, address: int, count: int) -> bytes:
+    def _recv_adu(self, txn_id: int) -> memoryview:
+        """
+        Receive the Modbus TCP ADU answering txn_id into the reusable buffer.
+        
+        The MBAP length field decides how many bytes follow, so responses
+        split across or coalesced within TCP segments are framed correctly.
+        Late responses to earlier, timed out requests are skipped. The
+        returned view is only valid until the next receive.
+        """
+        while True:
+            self._recv_into(0, 6)
+            rx_txn_id, _, length = _MBAP_PREFIX_STRUCT.unpack_from(self._rx_buf)
+            if not 2 <= length <= MAX_ADU_SIZE - 6:
+                raise ValueError(f"Invalid MBAP length {length}")
+            
+            self._recv_into(6, 6 + length)
+            self._rx_mid_frame = False
+            if rx_txn_id == txn_id:
+                break
+            logger.debug(f"Discarding stale response {rx_txn_id} from {self.host}")
+        
+        self.last_rx_monotonic = time.monotonic()
+        self._consecutive_timeouts = 0
+        
+        # The kernel clears quick ACK mode again after it is used
+        if self.quickack:
+            self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
+        
+        return self._rx_mv[:6 + length]
+    
+    def _recv_into(self, start: int, end: int):
+        """Fill the receive buffer from start to end."""
+        while start < end:
+            received = self.socket.recv_into(self._rx_mv[start:end])
+            if not received:
+                raise ConnectionError("Connection closed by RTU")
+            self._rx_mid_frame = True
+            start += received
+    
+    def _pack_request(self, txn_id: int, fc: int, address: int,
+                      value: int) -> bytearray:
+        """Pack an FC01-06 request into the reusable send buffer."""
+        _REQUEST_STRUCT.pack_into(self._tx_buf, 0, txn_id, 0, 6, 1, fc, address, value)
+        return self._tx_buf
+    
+    @staticmethod
+    def _build_request(txn_id: int, fc: int, address: int, count: int) -> bytes:
         """Build Modbus TCP request."""
-        # MBAP header (12 bytes)
-        request = bytearray()
-        request.extend(struct.pack('>HHH', txn_id, 0, 6))  # Transaction, protocol, length
-        request.append(1)  # Unit ID
-        request.append(fc)  # Function code
-        request.extend(struct.pack('>HH', address, count))  # Address, count
-        return bytes(request)
-    
-    def _build_write_request(self, txn_id: int, fc: int, address: int, 
-                           value: int) -> bytes:
+        return _REQUEST_STRUCT.pack(txn_id, 0, 6, 1, fc, address, count)
+    
+    @staticmethod
+    def _build_write_request(txn_id: int, fc: int, address: int,
+                             value: int) -> bytes:
         """Build Modbus TCP write request (FC05/06)."""
-        request = bytearray()
-        request.extend(struct.pack('>HHH', txn_id, 0, 6))  # Transaction, protocol, length
-        request.append(1)  # Unit ID
-        request.append(fc)  # Function code
-        request.extend(struct.pack('>H', address))  # Address
-        request.extend(struct.pack('>H', value))  # Value
-        return bytes(request)
-    
-    def _parse_read_response(self, response: bytes) -> Optional[List[int]]:
-        """Parse Modbus read response."""
+        return _REQUEST_STRUCT.pack(txn_id, 0, 6, 1, fc, address, value)
+    
+    @staticmethod
+    def _build_write_multiple_request(txn_id: int, address: int,
+                                      values: List[int]) -> bytes:
+        """Build Modbus TCP write multiple registers request (FC16)."""
+        count = len(values)
+        return (_WRITE_MULTIPLE_HEADER_STRUCT.pack(txn_id, 0, 7 + 2 * count, 1, 16,
+                                                   address, count, 2 * count)
+                + _REGISTER_STRUCTS[count].pack(*values))
+    
+    @staticmethod
+    def _build_read_write_request(txn_id: int, read_address: int, read_count: int,
+                                  write_address: int, values: List[int]) -> bytes:
+        """Build Modbus TCP read/write multiple registers request (FC23)."""
+        count = len(values)
+        return (_READ_WRITE_HEADER_STRUCT.pack(txn_id, 0, 11 + 2 * count, 1, 23,
+                                               read_address, read_count,
+                                               write_address, count, 2 * count)
+                + _REGISTER_STRUCTS[count].pack(*values))
+    
+    @staticmethod
+    def _parse_read_response_raw(response: bytes) -> Tuple[int, memoryview]:
+        """Parse Modbus read response into register count and data view."""
         if len(response) < 9:
             raise ValueError("Response too short")
         
@@ -320,26 +657,346 @@ class ModbusClient:
             raise Exception(f"Modbus exception {exception_code}")
         
         byte_count = response[8]
-        values = []
-        
-        for i in range(byte_count // 2):
-            offset = 9 + (i * 2)
-            if offset + 1 < len(response):
-                value = struct.unpack('>H', response[offset:offset+2])[0]
-                values.append(value)
+        if 9 + byte_count > len(response):
+            raise ValueError("Response truncated")
         
+        return byte_count // 2, memoryview(response)[9:9 + byte_count]
+    
+    @staticmethod
+    def _parse_read_response(response: bytes) -> Optional[List[int]]:
+        """Parse Modbus read response."""
+        count, data = ModbusClient._parse_read_response_raw(response)
+        values = list(_REGISTER_STRUCTS[count].unpack_from(data))
         return values if values else None
     
+    @staticmethod
+    def _parse_coil_response(response: bytes, count: int) -> Optional[List[bool]]:
+        """Parse Modbus coil response, eight coils per byte."""
+        coils = []
+        if len(response) >= 9:
+            for b in response[9:9 + response[8]]:
+                coils.extend(_COIL_BITS[b])
+            del coils[count:]
+        return coils if coils else None
+    
     def is_healthy(self) -> bool:
         """Check if connection is healthy."""
         if not self.connected:
             return False
         
         # Check for timeout
-        if (datetime.now() - self.last_rx_time).total_seconds() > 10:
+        return time.monotonic() - self.last_rx_monotonic <= RX_HEALTH_TIMEOUT_S
+
+
+class AsyncModbusClient:
+    """
+    Asyncio Modbus TCP client for polling many RTUs from one event loop.
+    
+    Requests are pipelined on a single connection: a reader task matches
+    each response to its request by transaction ID, so several requests
+    may be in flight at once. Framing and parsing are shared with
+    ModbusClient, which remains the blocking API.
+    """
+    
+    def __init__(self, host: str, port: int = 502, timeout_s: float = 2.0):
+        """
+        Initialize async Modbus client.
+        
+        Args:
+            host: RTU IP address or hostname
+            port: Modbus TCP port (default 502)
+            timeout_s: Per-request response timeout in seconds
+        """
+        self.host = host
+        self.port = port
+        self.timeout_s = timeout_s
+        self.transaction_id = 0
+        self.connected = False
+        self.last_error: Optional[str] = None
+        self.last_rx_monotonic: float = time.monotonic()
+        
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        
+        # Concurrent first requests share one connection attempt
+        self._connect_lock = asyncio.Lock()
+        
+        # In-flight requests by transaction ID
+        self._pending: Dict[int, asyncio.Future] = {}
+        
+        # Connection statistics
+        self.stats = {
+            'connections': 0,
+            'disconnections': 0,
+            'reads': 0,
+            'writes': 0,
+            'errors': 0,
+        }
+    
+    async def connect(self) -> bool:
+        """
+        Connect to RTU via Modbus TCP.
+        
+        Returns:
+            True if connection successful, False otherwise
+        """
+        try:
+            self._reader, self._writer = await asyncio.wait_for(
+                asyncio.open_connection(self.host, self.port), self.timeout_s)
+        
+        except Exception as e:
+            self.last_error = str(e)
+            self.connected = False
+            logger.error(f"Modbus connection failed to {self.host}: {e}")
             return False
         
+        self.connected = True
+        self.stats['connections'] += 1
+        self._reader_task = asyncio.create_task(self._read_responses())
+        logger.info(f"Modbus connected to {self.host}:{self.port}")
         return True
+    
+    async def disconnect(self):
+        """Disconnect from RTU."""
+        if self._reader_task:
+            self._reader_task.cancel()
+            try:
+                await self._reader_task
+            except asyncio.CancelledError:
+                pass
+            self._reader_task = None
+        
+        self._close(ConnectionError("Disconnected"))
+        self.stats['disconnections'] += 1
+        logger.info(f"Modbus disconnected from {self.host}:{self.port}")
+    
+    def _close(self, error: Exception):
+        """Close the connection and fail all in-flight requests."""
+        self.connected = False
+        if self._writer:
+            self._writer.close()
+            self._writer = None
+        
+        pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(error)
+    
+    def _get_transaction_id(self) -> int:
+        """Get next transaction ID (1-65535)."""
+        self.transaction_id = (self.transaction_id % 65535) + 1
+        return self.transaction_id
+    
+    async def _read_responses(self):
+        """Reader task: route each response ADU to its waiting request."""
+        try:
+            while True:
+                header = await self._reader.readexactly(6)
+                txn_id, _, length = _MBAP_PREFIX_STRUCT.unpack(header)
+                if not 2 <= length <= MAX_ADU_SIZE - 6:
+                    raise ValueError(f"Invalid MBAP length {length}")
+                
+                adu = header + await self._reader.readexactly(length)
+                self.last_rx_monotonic = time.monotonic()
+                
+                future = self._pending.pop(txn_id, None)
+                if future is not None and not future.done():
+                    future.set_result(adu)
+        
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.last_error = str(e)
+            logger.error(f"Modbus receive failed for {self.host}: {e}")
+            self._close(ConnectionError(f"Receive failed: {e}"))
+    
+    async def _transact(self, request_builder, *args) -> bytes:
+        """Send one request and wait for the response ADU with its ID."""
+        if not self.connected:
+            async with self._connect_lock:
+                if not self.connected and not await self.connect():
+                    raise ConnectionError(self.last_error)
+        
+        txn_id = self._get_transaction_id()
+        future = asyncio.get_running_loop().create_future()
+        self._pending[txn_id] = future
+        
+        try:
+            self._writer.write(request_builder(txn_id, *args))
+            await self._writer.drain()
+            return await asyncio.wait_for(future, self.timeout_s)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"No response within {self.timeout_s}s") from None
+        finally:
+            self._pending.pop(txn_id, None)
+    
+    async def _read(self, fc: int, address: int, count: int) -> Optional[bytes]:
+        """Issue a read request, returning the response ADU or None on error."""
+        try:
+            response = await self._transact(ModbusClient._build_request,
+                                            fc, address, count)
+            self.stats['reads'] += 1
+            return response
+        
+        except Exception as e:
+            self.last_error = str(e)
+            self.stats['errors'] += 1
+            logger.error(f"Read failed for {self.host}: {e}")
+            return None
+    
+    async def _write(self, request_builder, *args) -> bool:
+        """Issue a write request, returning True if the RTU accepted it."""
+        try:
+            response = await self._transact(request_builder, *args)
+            self.stats['writes'] += 1
+            
+            # Check for exception
+            if len(response) > 8 and response[7] & 0x80:
+                raise Exception(f"Modbus exception {response[8]}")
+            
+            return True
+        
+        except Exception as e:
+            self.last_error = str(e)
+            self.stats['errors'] += 1
+            logger.error(f"Write failed for {self.host}: {e}")
+            return False
+    
+    async def read_holding_registers(self, address: int, count: int = 1) -> Optional[List[int]]:
+        """Read holding registers (FC03). Returns values, or None on error."""
+        response = await self._read(3, address, count)
+        if response is None:
+            return None
+        
+        try:
+            return ModbusClient._parse_read_response(response)
+        except Exception as e:
+            self.last_error = str(e)
+            self.stats['errors'] += 1
+            logger.error(f"Read failed for {self.host}: {e}")
+            return None
+    
+    async def read_input_registers(self, address: int, count: int = 1) -> Optional[List[int]]:
+        """Read input registers (FC04). Returns values, or None on error."""
+        response = await self._read(4, address, count)
+        if response is None:
+            return None
+        
+        try:
+            return ModbusClient._parse_read_response(response)
+        except Exception as e:
+            self.last_error = str(e)
+            self.stats['errors'] += 1
+            logger.error(f"Read failed for {self.host}: {e}")
+            return None
+    
+    async def read_coils(self, address: int, count: int = 1) -> Optional[List[bool]]:
+        """Read coils (FC01). Returns coil states, or None on error."""
+        response = await self._read(1, address, count)
+        if response is None:
+            return None
+        return ModbusClient._parse_coil_response(response, count)
+    
+    async def write_register(self, address: int, value: int) -> bool:
+        """Write single register (FC06)."""
+        return await self._write(ModbusClient._build_write_request, 6, address, value)
+    
+    async def write_coil(self, address: int, value: bool) -> bool:
+        """Write single coil (FC05)."""
+        return await self._write(ModbusClient._build_write_request, 5, address,
+                                 0xFF00 if value else 0x0000)
+    
+    async def write_registers(self, address: int, values: List[int]) -> bool:
+        """Write multiple registers (FC16, 1-123 values)."""
+        if not 1 <= len(values) <= MAX_WRITE_REGISTERS:
+            self.last_error = f"Invalid register count {len(values)}"
+            logger.error(f"Write failed for {self.host}: {self.last_error}")
+            return False
+        return await self._write(ModbusClient._build_write_multiple_request,
+                                 address, values)
+    
+    async def read_write_multiple_registers(self, read_address: int, read_count: int,
+                                            write_address: int,
+                                            values: List[int]) -> Optional[List[int]]:
+        """Write then read registers in one request (FC23). Returns read values."""
+        if (not 1 <= read_count <= MAX_READ_REGISTERS
+                or not 1 <= len(values) <= MAX_READ_WRITE_REGISTERS):
+            self.last_error = f"Invalid register count {read_count}/{len(values)}"
+            logger.error(f"Read/write failed for {self.host}: {self.last_error}")
+            return None
+        
+        try:
+            response = await self._transact(ModbusClient._build_read_write_request,
+                                            read_address, read_count,
+                                            write_address, values)
+            self.stats['reads'] += 1
+            self.stats['writes'] += 1
+            return ModbusClient._parse_read_response(response)
+        
+        except Exception as e:
+            self.last_error = str(e)
+            self.stats['errors'] += 1
+            logger.error(f"Read/write failed for {self.host}: {e}")
+            return None
+    
+    def is_healthy(self) -> bool:
+        """Check if connection is healthy."""
+        if not self.connected:
+            return False
+        
+        # Check for timeout
+        return time.monotonic() - self.last_rx_monotonic <= RX_HEALTH_TIMEOUT_S
+
+
+class ModbusMaster:
+    """
+    Polls many RTUs concurrently from one event loop.
+    
+    Each RTU gets an AsyncModbusClient. All their sockets are watched by
+    the loop's single selector (epoll on Linux), so a polling cycle waits
+    once for every device instead of blocking on each in turn.
+    """
+    
+    def __init__(self, timeout_s: float = 2.0):
+        """
+        Initialize Modbus master.
+        
+        Args:
+            timeout_s: Per-request response timeout for every RTU
+        """
+        self.timeout_s = timeout_s
+        self.clients: Dict[str, AsyncModbusClient] = {}
+    
+    def add_rtu(self, name: str, host: str, port: int = 502) -> AsyncModbusClient:
+        """Register an RTU under name and return its client."""
+        client = AsyncModbusClient(host, port, self.timeout_s)
+        self.clients[name] = client
+        return client
+    
+    async def read_holding_registers(self, requests: Dict[str, Tuple[int, int]]
+                                     ) -> Dict[str, Optional[List[int]]]:
+        """
+        Read holding registers from several RTUs at once.
+        
+        Args:
+            requests: RTU name -> (address, count)
+        
+        Returns:
+            RTU name -> register values, or None for RTUs that failed
+        """
+        names = list(requests)
+        results = await asyncio.gather(*(
+            self.clients[name].read_holding_registers(*requests[name])
+            for name in names
+        ))
+        return dict(zip(names, results))
+    
+    async def close(self):
+        """Disconnect from all connected RTUs."""
+        await asyncio.gather(*(client.disconnect()
+                               for client in self.clients.values()
+                               if client.connected))
 
 
 if __name__ == "__main__":
@@ -34,9 +34,16 @@ from typing import Dict
 from enum import IntFlag
 import time
 
+import numpy as np
+
 from config import DATA_QUALITY
 
 
+# Modbus register addresses are 16-bit, so per-register state is kept in
+# dense arrays indexed directly by address
+MAX_REGISTERS = 65536
+
+
 class DataQuality(IntFlag):
     """Data quality flags (IEC 61968)."""
     GOOD = DATA_QUALITY["GOOD"]
@@ -46,37 +53,64 @@ class DataQuality(IntFlag):
     UNDERRANGE = DATA_QUALITY["UNDERRANGE"]
 
 
+# Plain int codes for internal use; IntFlag comparisons and conversions
+# are much slower and only needed at the API boundary
+_GOOD = DataQuality.GOOD.value
+_SUSPECT = DataQuality.SUSPECT.value
+_BAD = DataQuality.BAD.value
+
+# Quality after N consecutive missed polls: unchanged (None) below 3,
+# SUSPECT from 3, BAD from 10 on (the last entry covers all higher counts)
+_TIMEOUT_QUALITY = (None,) * 3 + (_SUSPECT,) * 7 + (_BAD,)
+
+# Quality levels reported by get_quality_summary, with their codes
+_SUMMARY_LEVELS = tuple(
+    (name, DataQuality[name].value)
+    for name in ("GOOD", "SUSPECT", "BAD", "OVERFLOW", "UNDERRANGE")
+)
+
+
 class DataQualityManager:
     """
     Manages data quality for all registers.
     
-    Tracks quality for each register and degradation rules.
+    Tracks quality for each register and degradation rules. State is
+    stored as parallel arrays over the register address space, so
+    device-wide operations and summaries are single vectorized passes.
     """
     
     def __init__(self):
         # Quality state for each register address
-        self.register_quality: Dict[int, DataQuality] = {}
+        self._quality = np.full(MAX_REGISTERS, _BAD, dtype=np.uint8)
         
-        # Last update time for each register (for staleness detection)
-        self.register_last_update: Dict[int, float] = {}
+        # Registers whose quality has been set (the rest read as BAD)
+        self._tracked = np.zeros(MAX_REGISTERS, dtype=bool)
+        
+        # Last update time for each register (monotonic clock, for staleness detection)
+        self._last_update = np.zeros(MAX_REGISTERS, dtype=np.float64)
         
         # Missed poll counter for each register
-        self.register_missed_polls: Dict[int, int] = {}
+        self._missed_polls = np.zeros(MAX_REGISTERS, dtype=np.uint32)
     
     def set_quality(self, register_address: int, quality: DataQuality):
         """
         Set quality for a register.
         
         Args:
-            register_address: Modbus register address
-            quality: Quality code
+            register_address: Modbus register address (0-65535)
+            quality: Quality code (DataQuality or its int value)
         """
-        self.register_quality[register_address] = quality
-        self.register_last_update[register_address] = time.time()
+        if not 0 <= register_address < MAX_REGISTERS:
+            raise ValueError(f"Invalid register address {register_address}")
+        
+        quality = int(quality)
+        self._quality[register_address] = quality
+        self._tracked[register_address] = True
+        self._last_update[register_address] = time.monotonic()
         
         # Reset missed poll counter on successful update
-        if quality == DataQuality.GOOD:
-            self.register_missed_polls[register_address] = 0
+        if quality == _GOOD:
+            self._missed_polls[register_address] = 0
     
     def get_quality(self, register_address: int) -> DataQuality:
         """
@@ -88,7 +122,9 @@ class DataQualityManager:
         Returns:
             Quality code (defaults to BAD if never set)
         """
-        return self.register_quality.get(register_address, DataQuality.BAD)
+        if not 0 <= register_address < MAX_REGISTERS:
+            return DataQuality.BAD
+        return DataQuality(int(self._quality[register_address]))
     
     def mark_communication_timeout(self, register_address: int):
         """
@@ -99,13 +135,31 @@ class DataQualityManager:
         Args:
             register_address: Modbus register address
         """
-        missed = self.register_missed_polls.get(register_address, 0) + 1
-        self.register_missed_polls[register_address] = missed
+        if not 0 <= register_address < MAX_REGISTERS:
+            raise ValueError(f"Invalid register address {register_address}")
+        
+        missed = int(self._missed_polls[register_address]) + 1
+        self._missed_polls[register_address] = missed
+        
+        quality = _TIMEOUT_QUALITY[min(missed, len(_TIMEOUT_QUALITY) - 1)]
+        if quality is not None:
+            self.set_quality(register_address, quality)
+    
+    def mark_all_communication_timeout(self):
+        """
+        Mark every tracked register as having missed a poll (device timeout).
+        
+        Same degradation as mark_communication_timeout, applied to all
+        registers in one vectorized pass.
+        """
+        addresses = np.flatnonzero(self._tracked)
+        missed = self._missed_polls[addresses] + 1
+        self._missed_polls[addresses] = missed
         
-        if missed >= 10:
-            self.set_quality(register_address, DataQuality.BAD)
-        elif missed >= 3:
-            self.set_quality(register_address, DataQuality.SUSPECT)
+        degraded = addresses[missed >= 3]
+        self._quality[degraded] = np.where(missed[missed >= 3] >= 10,
+                                           _BAD, _SUSPECT)
+        self._last_update[degraded] = time.monotonic()
     
     def check_value_range(
         self,
@@ -138,14 +192,12 @@ class DataQualityManager:
     
     def mark_all_bad(self):
         """Mark all registers as BAD (device failure)."""
-        for addr in list(self.register_quality.keys()):
-            self.register_quality[addr] = DataQuality.BAD
+        self._quality[self._tracked] = _BAD
     
     def mark_all_good(self):
         """Mark all registers as GOOD (recovery from failure)."""
-        for addr in list(self.register_quality.keys()):
-            self.register_quality[addr] = DataQuality.GOOD
-            self.register_missed_polls[addr] = 0
+        self._quality[self._tracked] = _GOOD
+        self._missed_polls[self._tracked] = 0
     
     def get_quality_summary(self) -> Dict[str, int]:
         """
@@ -154,24 +206,6 @@ class DataQualityManager:
         Returns:
             Dict with count of registers at each quality level
         """
-        summary = {
-            "GOOD": 0,
-            "SUSPECT": 0,
-            "BAD": 0,
-            "OVERFLOW": 0,
-            "UNDERRANGE": 0,
-        }
-        
-        for quality in self.register_quality.values():
-            if quality == DataQuality.GOOD:
-                summary["GOOD"] += 1
-            elif quality == DataQuality.SUSPECT:
-                summary["SUSPECT"] += 1
-            elif quality == DataQuality.BAD:
-                summary["BAD"] += 1
-            elif quality == DataQuality.OVERFLOW:
-                summary["OVERFLOW"] += 1
-            elif quality == DataQuality.UNDERRANGE:
-                summary["UNDERRANGE"] += 1
-        
-        return summary
+        counts = np.bincount(self._quality[self._tracked], minlength=256)
+        
+        return {name: int(counts[code]) for name, code in _SUMMARY_LEVELS}
@@ -38,13 +38,92 @@ This register map is the interface between electrical simulation and
 protocol communication - it's what a real SCADA master polls.
 """
 
-from typing import Dict, List, Tuple
+import math
+from typing import Callable, Dict, List, Optional, Tuple
 from enum import IntEnum
 import numpy as np
 
 from config import DATA_QUALITY
 
 
+# Frequency encoded in place of a non-finite reading
+_NOMINAL_FREQUENCY_HZ = 50.0
+
+
+# Value encoders/decoders. Defined as plain functions so callers resolve
+# them with a global lookup; ModbusRegisterMap exposes them as static
+# methods for existing callers.
+
+def _scale_to_int(value: float, scale: float) -> int:
+    """Scale a value and round half away from zero (not round()'s half-even)."""
+    scaled = value * scale
+    if scaled >= 0:
+        return int(scaled + 0.5)
+    return -int(0.5 - scaled)
+
+
+def encode_voltage_kv(voltage_kv: float) -> int:
+    """Encode voltage (kV) to 16-bit register value."""
+    return _scale_to_int(voltage_kv, 10.0)
+
+
+def decode_voltage_kv(register_value: int) -> float:
+    """Decode voltage register value to kV."""
+    return float(register_value) / 10.0
+
+
+def encode_current_a(current_a: float) -> int:
+    """Encode current (A) to 16-bit register value."""
+    return _scale_to_int(current_a, 1.0)
+
+
+def decode_current_a(register_value: int) -> float:
+    """Decode current register value to A."""
+    return float(register_value)
+
+
+def encode_power_mw(power_mw: float) -> int:
+    """Encode power (MW) to 16-bit register value."""
+    return _scale_to_int(power_mw, 10.0)
+
+
+def decode_power_mw(register_value: int) -> float:
+    """Decode power register value to MW."""
+    return float(register_value) / 10.0
+
+
+def encode_frequency_hz(frequency_hz: float) -> int:
+    """Encode frequency (Hz) to 16-bit register value."""
+    if not math.isfinite(frequency_hz):
+        frequency_hz = _NOMINAL_FREQUENCY_HZ
+    return _scale_to_int(frequency_hz, 1000.0)
+
+
+def decode_frequency_hz(register_value: int) -> float:
+    """Decode frequency register value to Hz."""
+    return float(register_value) / 1000.0
+
+
+def encode_temperature_c(temp_c: float) -> int:
+    """Encode temperature (°C) to 16-bit register value."""
+    return _scale_to_int(temp_c, 10.0)
+
+
+def decode_temperature_c(register_value: int) -> float:
+    """Decode temperature register value to °C."""
+    return float(register_value) / 10.0
+
+
+def encode_power_factor(pf: float) -> int:
+    """Encode power factor to 16-bit register value."""
+    return _scale_to_int(pf, 1000.0)
+
+
+def decode_power_factor(register_value: int) -> float:
+    """Decode power factor register value."""
+    return float(register_value) / 1000.0
+
+
 class RegisterType(IntEnum):
     """Modbus register types."""
     COIL = 0            # Discrete output (read/write)
@@ -196,6 +275,32 @@ class ModbusRegisterMap:
         "ufls_enable": 5,                # UFLS enable
     }
     
+    # Per node type lookup tables for the getters below
+    _REGISTER_MAPS = {
+        "GENERATION": GENERATION_REGISTERS,
+        "TRANSMISSION": SUBSTATION_REGISTERS,
+        "DISTRIBUTION": DISTRIBUTION_REGISTERS,
+    }
+    _DISCRETE_INPUT_MAPS = {
+        "GENERATION": GENERATION_DISCRETE_INPUTS,
+        "TRANSMISSION": SUBSTATION_DISCRETE_INPUTS,
+        "DISTRIBUTION": DISTRIBUTION_DISCRETE_INPUTS,
+    }
+    _COIL_MAPS = {
+        "GENERATION": GENERATION_COILS,
+        "TRANSMISSION": SUBSTATION_COILS,
+        "DISTRIBUTION": DISTRIBUTION_COILS,
+    }
+    
+    # Inverse register maps (address -> register name), built once
+    _REGISTER_NAMES = {
+        node_type: {address: name for name, address in registers.items()}
+        for node_type, registers in _REGISTER_MAPS.items()
+    }
+    _COMMON_REGISTER_NAMES = {
+        address: name for name, address in COMMON_INPUT_REGISTERS.items()
+    }
+    
     @staticmethod
     def get_register_map(node_type: str) -> Dict[str, int]:
         """
@@ -207,118 +312,171 @@ class ModbusRegisterMap:
         Returns:
             Dict mapping register name to address
         """
-        if node_type == "GENERATION":
-            return ModbusRegisterMap.GENERATION_REGISTERS
-        elif node_type == "TRANSMISSION":
-            return ModbusRegisterMap.SUBSTATION_REGISTERS
-        elif node_type == "DISTRIBUTION":
-            return ModbusRegisterMap.DISTRIBUTION_REGISTERS
-        else:
-            return ModbusRegisterMap.COMMON_INPUT_REGISTERS
+        return ModbusRegisterMap._REGISTER_MAPS.get(
+            node_type, ModbusRegisterMap.COMMON_INPUT_REGISTERS
+        )
+    
+    @staticmethod
+    def get_register_name(node_type: str, address: int) -> Optional[str]:
+        """
+        Get the register name at an address for node type.
+        
+        Args:
+            node_type: "GENERATION", "TRANSMISSION", or "DISTRIBUTION"
+            address: Register address
+        
+        Returns:
+            Register name, or None if the address is not mapped
+        """
+        names = ModbusRegisterMap._REGISTER_NAMES.get(
+            node_type, ModbusRegisterMap._COMMON_REGISTER_NAMES
+        )
+        return names.get(address)
     
     @staticmethod
     def get_discrete_inputs(node_type: str) -> Dict[str, int]:
         """Get discrete input addresses for node type."""
-        if node_type == "GENERATION":
-            return ModbusRegisterMap.GENERATION_DISCRETE_INPUTS
-        elif node_type == "TRANSMISSION":
-            return ModbusRegisterMap.SUBSTATION_DISCRETE_INPUTS
-        elif node_type == "DISTRIBUTION":
-            return ModbusRegisterMap.DISTRIBUTION_DISCRETE_INPUTS
-        else:
-            return {}
+        return ModbusRegisterMap._DISCRETE_INPUT_MAPS.get(node_type, {})
     
     @staticmethod
     def get_coils(node_type: str) -> Dict[str, int]:
         """Get coil addresses for node type."""
-        if node_type == "GENERATION":
-            return ModbusRegisterMap.GENERATION_COILS
-        elif node_type == "TRANSMISSION":
-            return ModbusRegisterMap.SUBSTATION_COILS
-        elif node_type == "DISTRIBUTION":
-            return ModbusRegisterMap.DISTRIBUTION_COILS
-        else:
-            return {}
-    
-    @staticmethod
-    def encode_voltage_kv(voltage_kv: float) -> int:
-        """Encode voltage (kV) to 16-bit register value."""
-        return int(round(voltage_kv * 10.0))
-    
-    @staticmethod
-    def decode_voltage_kv(register_value: int) -> float:
-        """Decode voltage register value to kV."""
-        return float(register_value) / 10.0
-    
-    @staticmethod
-    def encode_current_a(current_a: float) -> int:
-        """Encode current (A) to 16-bit register value."""
-        return int(round(current_a))
+        return ModbusRegisterMap._COIL_MAPS.get(node_type, {})
     
-    @staticmethod
-    def decode_current_a(register_value: int) -> float:
-        """Decode current register value to A."""
-        return float(register_value)
+    encode_voltage_kv = staticmethod(encode_voltage_kv)
+    decode_voltage_kv = staticmethod(decode_voltage_kv)
+    encode_current_a = staticmethod(encode_current_a)
+    decode_current_a = staticmethod(decode_current_a)
+    encode_power_mw = staticmethod(encode_power_mw)
+    decode_power_mw = staticmethod(decode_power_mw)
+    encode_frequency_hz = staticmethod(encode_frequency_hz)
+    decode_frequency_hz = staticmethod(decode_frequency_hz)
+    encode_temperature_c = staticmethod(encode_temperature_c)
+    decode_temperature_c = staticmethod(decode_temperature_c)
+    encode_power_factor = staticmethod(encode_power_factor)
+    decode_power_factor = staticmethod(decode_power_factor)
+
+
+# Module-level aliases
+encode_temperature_celsius = encode_temperature_c
+decode_temperature_celsius = decode_temperature_c
+
+
+# Export register map dictionaries
+GENERATION_REGISTERS = ModbusRegisterMap.GENERATION_REGISTERS
+SUBSTATION_REGISTERS = ModbusRegisterMap.SUBSTATION_REGISTERS
+DISTRIBUTION_REGISTERS = ModbusRegisterMap.DISTRIBUTION_REGISTERS
+
+
+# Scaling by register name suffix: (suffix, encoder, scale)
+_SCALING_BY_SUFFIX = (
+    ("power_factor", encode_power_factor, 1000.0),
+    ("_hz", encode_frequency_hz, 1000.0),
+    ("_kv", encode_voltage_kv, 10.0),
+    ("_mwh", encode_power_mw, 10.0),
+    ("_mvar", encode_power_mw, 10.0),
+    ("_mw", encode_power_mw, 10.0),
+    ("_c", encode_temperature_celsius, 10.0),
+    ("_a", encode_current_a, 1.0),
+)
+
+
+def _build_register_scaling() -> Tuple[Dict[int, Callable[[float], int]], Dict[int, float]]:
+    """Map every scaled analog register address to its encoder and scale."""
+    encoders = {}
+    scales = {}
+    for registers in (GENERATION_REGISTERS, SUBSTATION_REGISTERS, DISTRIBUTION_REGISTERS):
+        for name, address in registers.items():
+            # Per-phase registers carry the unit before the phase tag
+            base_name = name.split("_ph_")[0]
+            for suffix, encoder, scale in _SCALING_BY_SUFFIX:
+                if base_name.endswith(suffix):
+                    encoders[address] = encoder
+                    scales[address] = scale
+                    break
+    return encoders, scales
+
+
+# Built once at import so scans need one dict lookup per register
+_ENCODER_BY_ADDRESS, _SCALE_BY_ADDRESS = _build_register_scaling()
+
+
+def encode_register(address: int, value: float) -> int:
+    """
+    Encode an engineering value for the analog register at address.
     
-    @staticmethod
-    def encode_power_mw(power_mw: float) -> int:
-        """Encode power (MW) to 16-bit register value."""
-        return int(round(power_mw * 10.0))
+    Raises KeyError for addresses without a scaled quantity (quality,
+    percent, count and tap position registers).
+    """
+    return _ENCODER_BY_ADDRESS[address](value)
+
+
+def decode_register(address: int, register_value: int) -> float:
+    """Decode the analog register at address to its engineering value."""
+    return float(register_value) / _SCALE_BY_ADDRESS[address]
+
+
+# Per node type (addresses, scales, defaults) vectors, built on first use
+_SCALE_VECTORS: Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+
+
+def get_scale_vector(node_type: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Get the scaled analog registers of a node type as aligned arrays.
     
-    @staticmethod
-    def decode_power_mw(register_value: int) -> float:
-        """Decode power register value to MW."""
-        return float(register_value) / 10.0
+    Args:
+        node_type: "GENERATION", "TRANSMISSION", or "DISTRIBUTION"
     
-    @staticmethod
-    def encode_frequency_hz(frequency_hz: float) -> int:
-        """Encode frequency (Hz) to 16-bit register value."""
-        if not np.isfinite(frequency_hz):
-            frequency_hz = 50.0  # Default to nominal
-        return int(round(frequency_hz * 1000.0))
+    Returns:
+        (addresses, scales, defaults) in register map order, for use with
+        encode_block. defaults holds the value a non-finite reading encodes
+        as (nominal frequency for Hz registers) and NaN where the scalar
+        encoder has none.
+    """
+    vectors = _SCALE_VECTORS.get(node_type)
+    if vectors is None:
+        addresses = [
+            address for address in ModbusRegisterMap.get_register_map(node_type).values()
+            if address in _SCALE_BY_ADDRESS
+        ]
+        vectors = (
+            np.array(addresses, dtype=np.intp),
+            np.array([_SCALE_BY_ADDRESS[a] for a in addresses], dtype=np.float64),
+            np.array([_NOMINAL_FREQUENCY_HZ if _ENCODER_BY_ADDRESS[a] is encode_frequency_hz
+                      else np.nan for a in addresses], dtype=np.float64),
+        )
+        _SCALE_VECTORS[node_type] = vectors
+    return vectors
+
+
+def encode_block(values: np.ndarray, scales: np.ndarray,
+                 defaults: np.ndarray) -> np.ndarray:
+    """
+    Encode a block of engineering values to register values in one pass.
     
-    @staticmethod
-    def decode_frequency_hz(register_value: int) -> float:
-        """Decode frequency register value to Hz."""
-        return float(register_value) / 1000.0
+    Gives exactly what the scalar encoders give for each register. Signed
+    quantities (reverse power flow, absorbed MVAR) stay negative, as
+    encode_power_mw returns them; astype(np.uint16) on the result stores
+    them as 16-bit two's complement. Nothing is clipped to 16 bits.
     
-    @staticmethod
-    def encode_temperature_c(temp_c: float) -> int:
-        """Encode temperature (°C) to 16-bit register value."""
-        return int(round(temp_c * 10.0))
+    Args:
+        values: Engineering values aligned with scales
+        scales: Per-register scale factors (see get_scale_vector)
+        defaults: Values substituted for non-finite readings (see get_scale_vector)
     
-    @staticmethod
-    def decode_temperature_c(register_value: int) -> float:
-        """Decode temperature register value to °C."""
-        return float(register_value) / 10.0
+    Returns:
+        int64 register values
     
-    @staticmethod
-    def encode_power_factor(pf: float) -> int:
-        """Encode power factor to 16-bit register value."""
-        return int(round(pf * 1000.0))
+    Raises:
+        ValueError: If a non-finite value has no default, as the scalar
+            encoders raise for it
+    """
+    values = np.asarray(values, dtype=np.float64)
+    finite = np.isfinite(values)
+    if not finite.all():
+        values = np.where(finite, values, defaults)
+        if not np.isfinite(values).all():
+            raise ValueError("Cannot encode a non-finite value for this register")
     
-    @staticmethod
-    def decode_power_factor(register_value: int) -> float:
-        """Decode power factor register value."""
-        return float(register_value) / 1000.0
-
-
-# Module-level convenience functions (delegates to class methods)
-encode_voltage_kv = ModbusRegisterMap.encode_voltage_kv
-decode_voltage_kv = ModbusRegisterMap.decode_voltage_kv
-encode_current_a = ModbusRegisterMap.encode_current_a
-decode_current_a = ModbusRegisterMap.decode_current_a
-encode_power_mw = ModbusRegisterMap.encode_power_mw
-decode_power_mw = ModbusRegisterMap.decode_power_mw
-encode_frequency_hz = ModbusRegisterMap.encode_frequency_hz
-decode_frequency_hz = ModbusRegisterMap.decode_frequency_hz
-encode_temperature_celsius = ModbusRegisterMap.encode_temperature_c
-decode_temperature_celsius = ModbusRegisterMap.decode_temperature_c
-encode_power_factor = ModbusRegisterMap.encode_power_factor
-decode_power_factor = ModbusRegisterMap.decode_power_factor
-
-
-# Export register map dictionaries
-GENERATION_REGISTERS = ModbusRegisterMap.GENERATION_REGISTERS
-SUBSTATION_REGISTERS = ModbusRegisterMap.SUBSTATION_REGISTERS
-DISTRIBUTION_REGISTERS = ModbusRegisterMap.DISTRIBUTION_REGISTERS
+    scaled = values * scales
+    return np.copysign(np.floor(np.abs(scaled) + 0.5), scaled).astype(np.int64)  # half away from zero
@@ -39,13 +39,20 @@ Anomaly Detection Features:
     - Connection tracking for network behavior profiling
 """
 
+import array
 import asyncio
 import struct
 import logging
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 import time
 
-from protocols.modbus.state_machine import ModbusStateMachine, ModbusException
+import numpy as np
+
+from protocols.modbus.state_machine import (
+    ModbusStateMachine,
+    ModbusException,
+    SUPPORTED_FUNCTION_CODES,
+)
 from protocols.modbus.register_map import (
     encode_voltage_kv,
     encode_current_a,
@@ -62,6 +69,42 @@ from config import MODBUS_CONFIG
 
 logger = logging.getLogger(__name__)
 
+# Most coils/registers one request may read or write (Modbus spec)
+MAX_READ_COILS = 2000
+MAX_READ_REGISTERS = 125
+MAX_WRITE_REGISTERS = 123
+
+# Log a full traceback for every Nth occurrence of an error type
+ERROR_TRACEBACK_INTERVAL = 100
+
+# Function codes served (and counted per FC in the statistics)
+_SUPPORTED_FUNCTION_CODES = tuple(sorted(SUPPORTED_FUNCTION_CODES))
+
+# MBAP header: transaction ID, protocol ID, length, unit ID
+_MBAP_STRUCT = struct.Struct('>HHHB')
+
+# Request address + quantity/value, and the FC05/06/16 echo responses
+_ADDRESS_VALUE_STRUCT = struct.Struct('>HH')
+_ECHO_RESPONSE_STRUCT = struct.Struct('>BHH')
+_FC16_REQUEST_HEADER_STRUCT = struct.Struct('>HHB')
+
+# FC + byte count (FC01 response prefix, exception responses)
+_BYTE_PAIR_STRUCT = struct.Struct('BB')
+
+# Prebuilt ILLEGAL_DATA_VALUE exception PDUs for malformed quantities/values
+_ILLEGAL_DATA_VALUE_RESPONSES = {
+    function_code: _BYTE_PAIR_STRUCT.pack(
+        function_code | 0x80, ModbusException.ILLEGAL_DATA_VALUE.value
+    )
+    for function_code in _SUPPORTED_FUNCTION_CODES
+}
+
+# FC03 response PDUs (FC + byte count + registers), indexed by register count
+_FC03_RESPONSE_STRUCTS = [struct.Struct(f'>BB{n}H') for n in range(MAX_READ_REGISTERS + 1)]
+
+# FC16 request register blocks, indexed by register count
+_REGISTER_BLOCK_STRUCTS = [struct.Struct(f'>{n}H') for n in range(MAX_WRITE_REGISTERS + 1)]
+
 
 class ModbusTCPServer:
     """
@@ -87,24 +130,35 @@ class ModbusTCPServer:
         # State machine for request processing
         self.state_machine = ModbusStateMachine(unit_id)
         
+        # Function code -> request handler
+        self._fc_handlers = {
+            1: self._handle_fc01,
+            3: self._handle_fc03,
+            5: self._handle_fc05,
+            6: self._handle_fc06,
+            16: self._handle_fc16,
+        }
+        
         # Server state
         self.server: Optional[asyncio.Server] = None
-        self.connections: List[asyncio.StreamWriter] = []
+        self.connections: Set[asyncio.StreamWriter] = set()
         
         # Statistics for anomaly detection
         self.stats = {
             "connections_total": 0,
             "connections_active": 0,
-            "requests_fc01": 0,
-            "requests_fc03": 0,
-            "requests_fc05": 0,
-            "requests_fc06": 0,
-            "requests_fc16": 0,
             "exceptions_total": 0,
             "bytes_received": 0,
             "bytes_sent": 0,
         }
         
+        # Per function code request counters, indexed by FC (reported
+        # as requests_fcNN by get_stats)
+        self._fc_requests = array.array('Q', [0]) * 256
+        
+        # Occurrences per exception type, to rate-limit traceback logging
+        self._error_counts: Dict[type, int] = {}
+        
         logger.info(f"Modbus TCP server initialized - Unit {unit_id}, Port {port}")
     
     async def start(self):
@@ -140,7 +194,7 @@ class ModbusTCPServer:
         addr = writer.get_extra_info('peername')
         logger.info(f"Connection from {addr}")
         
-        self.connections.append(writer)
+        self.connections.add(writer)
         self.stats["connections_total"] += 1
         self.stats["connections_active"] += 1
         
@@ -154,7 +208,7 @@ class ModbusTCPServer:
                 self.stats["bytes_received"] += 7
                 
                 # Parse MBAP header
-                transaction_id, protocol_id, length, unit_id = struct.unpack('>HHHB', header)
+                transaction_id, protocol_id, length, unit_id = _MBAP_STRUCT.unpack(header)
                 
                 # Validate header
                 if protocol_id != 0:
@@ -175,27 +229,25 @@ class ModbusTCPServer:
                 
                 # Build response MBAP + PDU
                 response_length = len(response_pdu) + 1  # +1 for unit ID
-                response_header = struct.pack('>HHHB',
+                response_header = _MBAP_STRUCT.pack(
                     transaction_id,
                     0,  # Protocol ID
                     response_length,
                     unit_id
                 )
                 
-                response = response_header + response_pdu
-                
-                # Send response
-                writer.write(response)
+                # Send response (header and PDU handed over without concatenating)
+                writer.writelines((response_header, response_pdu))
                 await writer.drain()
                 
-                self.stats["bytes_sent"] += len(response)
+                self.stats["bytes_sent"] += len(response_header) + len(response_pdu)
         
         except asyncio.IncompleteReadError:
             logger.info(f"Connection closed by {addr}")
         except Exception as e:
-            logger.error(f"Error handling connection from {addr}: {e}", exc_info=True)
+            self._log_error(f"Error handling connection from {addr}: {e}", e)
         finally:
-            self.connections.remove(writer)
+            self.connections.discard(writer)
             self.stats["connections_active"] -= 1
             writer.close()
             await writer.wait_closed()
@@ -213,9 +265,7 @@ class ModbusTCPServer:
         function_code = pdu[0]
         
         # Update request statistics
-        fc_key = f"requests_fc{function_code:02d}"
-        if fc_key in self.stats:
-            self.stats[fc_key] += 1
+        self._fc_requests[function_code] += 1
         
         # Try to accept request
         accepted, exception_code = self.state_machine.accept_request(
@@ -229,23 +279,15 @@ class ModbusTCPServer:
             return self._build_exception_response(function_code, exception_code)
         
         # Wait for processing delay
-        while not self.state_machine.is_processing_complete():
-            await asyncio.sleep(0.001)
+        await self.state_machine.wait_processing_complete()
         
         self.state_machine.transition_to_responding()
         
         # Dispatch to function-specific handler
         try:
-            if function_code == 1:
-                response = self._handle_fc01(pdu[1:])
-            elif function_code == 3:
-                response = self._handle_fc03(pdu[1:])
-            elif function_code == 5:
-                response = self._handle_fc05(pdu[1:])
-            elif function_code == 6:
-                response = self._handle_fc06(pdu[1:])
-            elif function_code == 16:
-                response = self._handle_fc16(pdu[1:])
+            handler = self._fc_handlers.get(function_code)
+            if handler is not None:
+                response = handler(memoryview(pdu)[1:])
             else:
                 # Should never reach here (state machine validates)
                 response = self._build_exception_response(
@@ -254,7 +296,7 @@ class ModbusTCPServer:
                 )
                 self.stats["exceptions_total"] += 1
         except Exception as e:
-            logger.error(f"Error processing FC{function_code:02d}: {e}", exc_info=True)
+            self._log_error(f"Error processing FC{function_code:02d}: {e}", e)
             response = self._build_exception_response(
                 function_code,
                 ModbusException.SLAVE_DEVICE_FAILURE.value
@@ -276,7 +318,11 @@ class ModbusTCPServer:
         Returns:
             Response PDU
         """
-        address, count = struct.unpack('>HH', data)
+        address, count = _ADDRESS_VALUE_STRUCT.unpack(data)
+        
+        # Validate quantity (1-2000 coils per spec)
+        if not 1 <= count <= MAX_READ_COILS:
+            return _ILLEGAL_DATA_VALUE_RESPONSES[1]
         
         # Validate address range
         valid, exception_code = self.state_machine.validate_address_range(
@@ -290,16 +336,10 @@ class ModbusTCPServer:
         
         # Pack coils into bytes (8 coils per byte, LSB first)
         byte_count = (count + 7) // 8
-        coil_bytes = bytearray(byte_count)
-        
-        for i, coil in enumerate(coils):
-            if coil:
-                byte_idx = i // 8
-                bit_idx = i % 8
-                coil_bytes[byte_idx] |= (1 << bit_idx)
+        coil_bytes = np.packbits(np.asarray(coils, dtype=bool), bitorder='little').tobytes()
         
         # Build response: FC + byte count + coil bytes
-        response = struct.pack('BB', 1, byte_count) + bytes(coil_bytes)
+        response = _BYTE_PAIR_STRUCT.pack(1, byte_count) + coil_bytes.ljust(byte_count, b'\x00')
         return response
     
     def _handle_fc03(self, data: bytes) -> bytes:
@@ -312,7 +352,11 @@ class ModbusTCPServer:
         Returns:
             Response PDU
         """
-        address, count = struct.unpack('>HH', data)
+        address, count = _ADDRESS_VALUE_STRUCT.unpack(data)
+        
+        # Validate quantity (1-125 registers per spec)
+        if not 1 <= count <= MAX_READ_REGISTERS:
+            return _ILLEGAL_DATA_VALUE_RESPONSES[3]
         
         # Validate address range
         valid, exception_code = self.state_machine.validate_address_range(
@@ -324,14 +368,11 @@ class ModbusTCPServer:
         # Read registers from node
         registers = self.node.read_holding_registers(address, count)
         
-        # Build response: FC + byte count + register values
-        byte_count = count * 2
-        response = struct.pack('BB', 3, byte_count)
-        
-        for reg in registers:
-            response += struct.pack('>H', reg)
-        
-        return response
+        # Build response: FC + byte count + register values. Array-backed
+        # nodes return a contiguous uint16 block, converted in one pass.
+        if isinstance(registers, np.ndarray):
+            return bytes((3, count * 2)) + registers.astype('>u2', copy=False).tobytes()
+        return _FC03_RESPONSE_STRUCTS[count].pack(3, count * 2, *registers)
     
     def _handle_fc05(self, data: bytes) -> bytes:
         """
@@ -343,20 +384,18 @@ class ModbusTCPServer:
         Returns:
             Response PDU
         """
-        address, value = struct.unpack('>HH', data)
+        address, value = _ADDRESS_VALUE_STRUCT.unpack(data)
         
         # Validate coil value (0x0000 or 0xFF00)
         if value not in [0x0000, 0xFF00]:
-            return self._build_exception_response(
-                5, ModbusException.ILLEGAL_DATA_VALUE.value
-            )
+            return _ILLEGAL_DATA_VALUE_RESPONSES[5]
         
         # Write coil to node
         coil_state = (value == 0xFF00)
         self.node.write_coil(address, coil_state)
         
         # Echo response
-        response = struct.pack('>BHH', 5, address, value)
+        response = _ECHO_RESPONSE_STRUCT.pack(5, address, value)
         return response
     
     def _handle_fc06(self, data: bytes) -> bytes:
@@ -369,7 +408,7 @@ class ModbusTCPServer:
         Returns:
             Response PDU
         """
-        address, value = struct.unpack('>HH', data)
+        address, value = _ADDRESS_VALUE_STRUCT.unpack(data)
         
         # Validate value range (0-65535 for uint16)
         valid, exception_code = self.state_machine.validate_write_value(
@@ -382,7 +421,7 @@ class ModbusTCPServer:
         self.node.write_holding_register(address, value)
         
         # Echo response
-        response = struct.pack('>BHH', 6, address, value)
+        response = _ECHO_RESPONSE_STRUCT.pack(6, address, value)
         return response
     
     def _handle_fc16(self, data: bytes) -> bytes:
@@ -395,28 +434,39 @@ class ModbusTCPServer:
         Returns:
             Response PDU
         """
-        address, count, byte_count = struct.unpack('>HHB', data[:5])
+        address, count, byte_count = _FC16_REQUEST_HEADER_STRUCT.unpack_from(data)
         
-        # Validate byte count
-        if byte_count != count * 2:
-            return self._build_exception_response(
-                16, ModbusException.ILLEGAL_DATA_VALUE.value
-            )
+        # Validate quantity (1-123 registers per spec) and byte count
+        if not 1 <= count <= MAX_WRITE_REGISTERS or byte_count != count * 2:
+            return _ILLEGAL_DATA_VALUE_RESPONSES[16]
         
-        # Extract register values
-        values = []
-        for i in range(count):
-            offset = 5 + (i * 2)
-            value, = struct.unpack('>H', data[offset:offset+2])
-            values.append(value)
+        # Extract all register values in one unpack
+        values = _REGISTER_BLOCK_STRUCTS[count].unpack_from(data, 5)
         
         # Write registers to node
         self.node.write_holding_registers(address, values)
         
         # Response: FC + address + count
-        response = struct.pack('>BHH', 16, address, count)
+        response = _ECHO_RESPONSE_STRUCT.pack(16, address, count)
         return response
     
+    def _log_error(self, message: str, error: Exception):
+        """
+        Log an unexpected error, with a traceback only once per
+        ERROR_TRACEBACK_INTERVAL occurrences of its exception type.
+        
+        Malformed frames from scans or fuzzing can raise the same error
+        on every request; formatting each traceback would dominate CPU.
+        """
+        error_type = type(error)
+        count = self._error_counts.get(error_type, 0) + 1
+        self._error_counts[error_type] = count
+        
+        if count % ERROR_TRACEBACK_INTERVAL == 1:
+            logger.error(message, exc_info=error)
+        else:
+            logger.error("%s (%s repeated %d times)", message, error_type.__name__, count)
+    
     def _build_exception_response(self, function_code: int, exception_code: int) -> bytes:
         """
         Build Modbus exception response.
@@ -430,27 +480,34 @@ class ModbusTCPServer:
         """
         # Exception response: (FC | 0x80) + Exception Code
         error_fc = function_code | 0x80
-        return struct.pack('BB', error_fc, exception_code)
+        return _BYTE_PAIR_STRUCT.pack(error_fc, exception_code)
     
     def get_stats(self) -> Dict:
         """Get server statistics."""
         stats = self.stats.copy()
+        for function_code in _SUPPORTED_FUNCTION_CODES:
+            stats[f"requests_fc{function_code:02d}"] = self._fc_requests[function_code]
         stats["state_machine"] = self.state_machine.get_stats()
         return stats
 
 
 # Example node interface (actual implementation in nodes/base_node.py)
 class MockNode:
-    """Mock node for testing - demonstrates the interface."""
+    """
+    Mock node for testing - demonstrates the interface.
+    
+    Stores coils and registers in numpy arrays; reads return views into
+    them. Nodes may also return plain lists, which the server accepts too.
+    """
     
     def __init__(self):
-        self.coils = [False] * 10000
-        self.holding_registers = [0] * 50000
+        self.coils = np.zeros(10000, dtype=bool)
+        self.holding_registers = np.zeros(50000, dtype=np.uint16)
     
-    def read_coils(self, address: int, count: int) -> List[bool]:
+    def read_coils(self, address: int, count: int) -> np.ndarray:
         return self.coils[address:address+count]
     
-    def read_holding_registers(self, address: int, count: int) -> List[int]:
+    def read_holding_registers(self, address: int, count: int) -> np.ndarray:
         return self.holding_registers[address:address+count]
     
     def write_coil(self, address: int, value: bool):
@@ -460,8 +517,7 @@ class MockNode:
         self.holding_registers[address] = value
     
     def write_holding_registers(self, address: int, values: List[int]):
-        for i, value in enumerate(values):
-            self.holding_registers[address + i] = value
+        self.holding_registers[address:address+len(values)] = values
 
 
 async def test_server():
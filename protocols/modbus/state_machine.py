@@ -34,6 +34,7 @@ The state machine enforces single-threaded request processing - only one
 request processed at a time, mirroring real RTU behavior.
 """
 
+import asyncio
 import time
 import random
 from enum import Enum
@@ -49,6 +50,17 @@ from config import MODBUS_CONFIG
 
 logger = logging.getLogger(__name__)
 
+# Function codes the simulated RTU implements
+SUPPORTED_FUNCTION_CODES = frozenset((1, 3, 5, 6, 16))
+
+# Processing delay per function code as (minimum, span) in nanoseconds,
+# from the "FCnn" entries of MODBUS_CONFIG["response_times_ms"]
+_PROCESSING_TIMES_NS = {
+    int(fc_key[2:]): (int(min_ms * 1_000_000), int((max_ms - min_ms) * 1_000_000))
+    for fc_key, (min_ms, max_ms) in MODBUS_CONFIG["response_times_ms"].items()
+}
+_DEFAULT_PROCESSING_TIME_NS = (10_000_000, 10_000_000)
+
 
 class ModbusState(Enum):
     """Modbus RTU processing states."""
@@ -66,6 +78,18 @@ class ModbusException(Enum):
     SLAVE_DEVICE_BUSY = 0x06
 
 
+class _CurrentRequest:
+    """Request being processed; one instance per state machine, reused."""
+    
+    __slots__ = ("function_code", "data", "transaction_id", "timestamp")
+    
+    def __init__(self):
+        self.function_code = 0
+        self.data: Optional[Dict] = None
+        self.transaction_id = 0
+        self.timestamp = 0.0
+
+
 class ModbusStateMachine:
     """
     State machine for Modbus request processing.
@@ -77,6 +101,19 @@ class ModbusStateMachine:
     - Transaction ID management
     """
     
+    __slots__ = (
+        "unit_id",
+        "state",
+        "processing_start_time",
+        "required_processing_time",
+        "_deadline_ns",
+        "current_request",
+        "_request",
+        "transaction_id",
+        "stats",
+        "_rng",
+    )
+    
     def __init__(self, unit_id: int):
         """
         Initialize state machine.
@@ -90,9 +127,13 @@ class ModbusStateMachine:
         # Processing timing
         self.processing_start_time = 0.0
         self.required_processing_time = 0.0
+        self._deadline_ns = 0  # time.monotonic_ns() when processing completes
+        self._rng = random.Random()  # per unit, not the shared module generator
         
         # Current request being processed
-        self.current_request: Optional[Dict] = None
+        # (points at the reused _request while a request is in progress)
+        self.current_request: Optional[_CurrentRequest] = None
+        self._request = _CurrentRequest()
         
         # Transaction ID counter
         self.transaction_id = 0
@@ -122,13 +163,13 @@ class ModbusStateMachine:
         
         # Check if busy
         if self.state != ModbusState.IDLE:
-            logger.warning(f"Unit {self.unit_id} BUSY - rejecting request FC{function_code:02d}")
+            logger.warning("Unit %d BUSY - rejecting request FC%02d", self.unit_id, function_code)
             self.stats["busy_rejections"] += 1
             return False, ModbusException.SLAVE_DEVICE_BUSY.value
         
         # Validate function code
-        if function_code not in [1, 3, 5, 6, 16]:
-            logger.error(f"Unit {self.unit_id} - Illegal function code: {function_code}")
+        if function_code not in SUPPORTED_FUNCTION_CODES:
+            logger.error("Unit %d - Illegal function code: %d", self.unit_id, function_code)
             self.stats["exceptions"] += 1
             return False, ModbusException.ILLEGAL_FUNCTION.value
         
@@ -137,28 +178,26 @@ class ModbusStateMachine:
         self.processing_start_time = time.time()
         
         # Determine processing time based on function code
-        fc_key = f"FC{function_code:02d}"
-        if fc_key in MODBUS_CONFIG["response_times_ms"]:
-            min_ms, max_ms = MODBUS_CONFIG["response_times_ms"][fc_key]
-            self.required_processing_time = random.uniform(min_ms, max_ms) / 1000.0
-        else:
-            # Default fallback
-            self.required_processing_time = random.uniform(10, 20) / 1000.0
+        min_ns, span_ns = _PROCESSING_TIMES_NS.get(function_code, _DEFAULT_PROCESSING_TIME_NS)
+        delay_ns = min_ns + int(span_ns * self._rng.random())
+        self._deadline_ns = time.monotonic_ns() + delay_ns
+        self.required_processing_time = delay_ns / 1e9
         
         # Store request
-        self.current_request = {
-            "function_code": function_code,
-            "data": request_data,
-            "transaction_id": self.transaction_id,
-            "timestamp": time.time(),
-        }
+        request = self._request
+        request.function_code = function_code
+        request.data = request_data
+        request.transaction_id = self.transaction_id
+        request.timestamp = time.time()
+        self.current_request = request
         
         self.transaction_id = (self.transaction_id + 1) % 65536  # 16-bit wraparound
         
-        logger.debug(
-            f"Unit {self.unit_id} - Accepted FC{function_code:02d}, "
-            f"processing time {self.required_processing_time*1000:.1f}ms"
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Unit %d - Accepted FC%02d, processing time %.1fms",
+                self.unit_id, function_code, self.required_processing_time * 1000,
+            )
         
         return True, None
     
@@ -169,17 +208,30 @@ class ModbusStateMachine:
         Returns:
             True if processing complete and ready for response
         """
+        return (
+            self.state == ModbusState.PROCESSING
+            and time.monotonic_ns() >= self._deadline_ns
+        )
+    
+    async def wait_processing_complete(self):
+        """
+        Wait until the processing delay of the current request has elapsed.
+        
+        Sleeps once for the remaining delay instead of polling
+        is_processing_complete(), so the event loop is woken exactly once.
+        """
         if self.state != ModbusState.PROCESSING:
-            return False
+            return
         
-        elapsed = time.time() - self.processing_start_time
-        return elapsed >= self.required_processing_time
+        remaining_ns = self._deadline_ns - time.monotonic_ns()
+        if remaining_ns > 0:
+            await asyncio.sleep(remaining_ns / 1e9)
     
     def transition_to_responding(self):
         """Transition from PROCESSING to RESPONDING state."""
         if self.state == ModbusState.PROCESSING:
             self.state = ModbusState.RESPONDING
-            logger.debug(f"Unit {self.unit_id} - Transitioning to RESPONDING")
+            logger.debug("Unit %d - Transitioning to RESPONDING", self.unit_id)
     
     def complete_response(self):
         """Complete response and return to IDLE state."""
@@ -187,13 +239,15 @@ class ModbusStateMachine:
             self.state = ModbusState.IDLE
             self.stats["successful_responses"] += 1
             self.current_request = None
-            logger.debug(f"Unit {self.unit_id} - Response complete, returning to IDLE")
+            self._request.data = None
+            logger.debug("Unit %d - Response complete, returning to IDLE", self.unit_id)
     
     def force_idle(self):
         """Force return to IDLE state (error condition)."""
         self.state = ModbusState.IDLE
         self.current_request = None
-        logger.warning(f"Unit {self.unit_id} - Forced to IDLE state")
+        self._request.data = None
+        logger.warning("Unit %d - Forced to IDLE state", self.unit_id)
     
     def get_state(self) -> str:
         """Get current state as string."""
@@ -230,8 +284,8 @@ class ModbusStateMachine:
         
         if end_address > max_address:
             logger.error(
-                f"Unit {self.unit_id} - Address out of range: "
-                f"{start_address}+{count} > {max_address}"
+                "Unit %d - Address out of range: %d+%d > %d",
+                self.unit_id, start_address, count, max_address,
             )
             return False, ModbusException.ILLEGAL_DATA_ADDRESS.value
         
@@ -256,8 +310,8 @@ class ModbusStateMachine:
         """
         if not (min_value <= value <= max_value):
             logger.error(
-                f"Unit {self.unit_id} - Value out of range: "
-                f"{value} not in [{min_value}, {max_value}]"
+                "Unit %d - Value out of range: %d not in [%d, %d]",
+                self.unit_id, value, min_value, max_value,
             )
             return False, ModbusException.ILLEGAL_DATA_VALUE.value
         
@@ -286,9 +340,8 @@ if __name__ == "__main__":
     
     # Test 3: Wait for processing to complete
     print("\nTest 3: Wait for processing delay...")
-    while not sm.is_processing_complete():
-        time.sleep(0.001)
-    print(f"  Processing complete!")
+    asyncio.run(sm.wait_processing_complete())
+    print(f"  Processing complete: {sm.is_processing_complete()}")
     
     # Test 4: Transition to responding
     print("\nTest 4: Transition to RESPONDING")
@@ -0,0 +1,518 @@
+"""
+Test Suite for Modbus TCP Protocol Implementation
+=================================================
+
+Tests validate:
+    - Client MBAP framing and timeout handling
+    - Batched read range coalescing
+    - Client/server round trips against MockNode
+    - Async client pipelining, late replies and reconnects
+    - Data quality degradation on communication timeouts
+    - Block register encoding against the scalar encoders
+"""
+
+import unittest
+import asyncio
+import socket
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directories to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from protocols.modbus.client import (
+    ModbusClient, AsyncModbusClient, ModbusMaster, MAX_WRITE_REGISTERS
+)
+from protocols.modbus.server import ModbusTCPServer, MockNode
+from protocols.modbus.data_quality import DataQualityManager, DataQuality
+from protocols.modbus.register_map import (
+    encode_block, encode_register, get_scale_vector,
+    encode_frequency_hz, encode_power_mw, ModbusRegisterMap,
+)
+
+
+def _fc03_response(txn_id: int, values) -> bytes:
+    """Build an FC03 response ADU for unit 1"""
+    byte_count = 2 * len(values)
+    return (struct.pack('>HHHBBB', txn_id, 0, byte_count + 3, 1, 3, byte_count)
+            + struct.pack(f'>{len(values)}H', *values))
+
+
+def _recv_request(conn: socket.socket) -> int:
+    """Receive one 12 byte FC01-06 request and return its transaction ID"""
+    data = b''
+    while len(data) < 12:
+        chunk = conn.recv(12 - len(data))
+        if not chunk:
+            raise ConnectionError("client closed")
+        data += chunk
+    return struct.unpack_from('>H', data)[0]
+
+
+async def _start_server():
+    """Start a ModbusTCPServer over a MockNode on a free port"""
+    server = ModbusTCPServer(MockNode(), unit_id=1, port=0)
+    await server.start()
+    return server, server.server.sockets[0].getsockname()[1]
+
+
+class _ScriptedRTU:
+    """
+    Raw TCP peer that runs handler(conn, index) for each accepted connection
+    
+    Lets tests misbehave in ways the real server never does (stall mid
+    frame, answer late or out of order).
+    """
+    
+    def __init__(self, handler):
+        self.handler = handler
+        self.connections = 0
+        self.listener = socket.create_server(('127.0.0.1', 0))
+        self.port = self.listener.getsockname()[1]
+        self.thread = threading.Thread(target=self._serve, daemon=True)
+        self.thread.start()
+    
+    def _serve(self):
+        while True:
+            try:
+                conn, _ = self.listener.accept()
+            except OSError:
+                return
+            index = self.connections
+            self.connections += 1
+            threading.Thread(target=self._run, args=(conn, index),
+                             daemon=True).start()
+    
+    def _run(self, conn: socket.socket, index: int):
+        with conn:
+            try:
+                self.handler(conn, index)
+            except (ConnectionError, OSError):
+                pass
+    
+    def close(self):
+        self.listener.close()
+
+
+class _ServerThread:
+    """ModbusTCPServer over a MockNode, run on its own event loop thread"""
+    
+    def __init__(self):
+        self.node = MockNode()
+        self.server = ModbusTCPServer(self.node, unit_id=1, port=0)
+        self.loop = asyncio.new_event_loop()
+        started = threading.Event()
+        
+        def run():
+            asyncio.set_event_loop(self.loop)
+            self.loop.run_until_complete(self.server.start())
+            started.set()
+            self.loop.run_forever()
+        
+        self.thread = threading.Thread(target=run, daemon=True)
+        self.thread.start()
+        started.wait(5.0)
+        self.port = self.server.server.sockets[0].getsockname()[1]
+    
+    def close(self):
+        asyncio.run_coroutine_threadsafe(self.server.stop(), self.loop).result(5.0)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(5.0)
+        self.loop.close()
+
+
+class TestCoalesceRanges(unittest.TestCase):
+    """Test merging of batched read ranges into FC03 requests"""
+    
+    def setUp(self):
+        """Set up an unconnected client"""
+        self.client = ModbusClient('127.0.0.1')
+    
+    def test_overlapping_ranges_merge(self):
+        """Test overlapping ranges become one read covering both"""
+        batches = self.client._coalesce_ranges([(5, 10), (0, 10)], 0)
+        self.assertEqual(batches, [(0, 15, [(0, 10), (5, 10)])])
+    
+    def test_contained_range_does_not_shrink_span(self):
+        """Test a range inside an earlier one keeps the longer span"""
+        batches = self.client._coalesce_ranges([(0, 20), (5, 2)], 0)
+        self.assertEqual(batches, [(0, 20, [(0, 20), (5, 2)])])
+    
+    def test_gap_threshold(self):
+        """Test ranges merge only when the gap is within gap_tolerance"""
+        ranges = [(0, 5), (5, 5), (12, 3)]
+        self.assertEqual(self.client._coalesce_ranges(ranges, 1),
+                         [(0, 10, [(0, 5), (5, 5)]), (12, 3, [(12, 3)])])
+        self.assertEqual(self.client._coalesce_ranges(ranges, 2),
+                         [(0, 15, [(0, 5), (5, 5), (12, 3)])])
+    
+    def test_register_cap(self):
+        """Test a merge never exceeds 125 registers per request"""
+        self.assertEqual(self.client._coalesce_ranges([(0, 100), (100, 25)], 0),
+                         [(0, 125, [(0, 100), (100, 25)])])
+        self.assertEqual(self.client._coalesce_ranges([(0, 100), (100, 26)], 0),
+                         [(0, 100, [(0, 100)]), (100, 26, [(100, 26)])])
+    
+    def test_coalescing_disabled(self):
+        """Test coalesce_reads=False issues one read per range"""
+        client = ModbusClient('127.0.0.1', coalesce_reads=False)
+        self.assertEqual(client._coalesce_ranges([(0, 5), (5, 5)], 0),
+                         [(0, 5, [(0, 5)]), (5, 5, [(5, 5)])])
+
+
+class TestModbusClientServer(unittest.TestCase):
+    """Test the blocking client against ModbusTCPServer and MockNode"""
+    
+    def setUp(self):
+        """Start a server and connect a client"""
+        self.rtu = _ServerThread()
+        self.addCleanup(self.rtu.close)
+        self.client = ModbusClient('127.0.0.1', self.rtu.port)
+        self.addCleanup(self.client.disconnect)
+    
+    def test_write_registers_round_trip(self):
+        """Test FC16 writes land in the node and read back over FC03"""
+        self.assertTrue(self.client.write_registers(4001, [1, 2, 65535]))
+        self.assertEqual(self.rtu.node.holding_registers[4001:4004].tolist(),
+                         [1, 2, 65535])
+        self.assertEqual(self.client.read_holding_registers(4000, 4),
+                         [0, 1, 2, 65535])
+    
+    def test_write_registers_quantity_limits(self):
+        """Test FC16 counts outside 1-123 are refused without a request"""
+        self.assertFalse(self.client.write_registers(4000, []))
+        self.assertFalse(self.client.write_registers(
+            4000, [0] * (MAX_WRITE_REGISTERS + 1)))
+        self.assertFalse(self.client.connected)
+        self.assertTrue(self.client.write_registers(
+            4000, list(range(MAX_WRITE_REGISTERS))))
+        self.assertEqual(self.rtu.node.holding_registers[4122], 122)
+    
+    def test_batch_read_slices_merged_response(self):
+        """Test batched ranges come back sliced from one merged read"""
+        self.rtu.node.holding_registers[3000:3020] = range(100, 120)
+        results = self.client.read_holding_registers_batch(
+            [(3000, 2), (3003, 2), (3010, 5)], gap_tolerance=5)
+        self.assertEqual(results, {
+            (3000, 2): [100, 101],
+            (3003, 2): [103, 104],
+            (3010, 5): [110, 111, 112, 113, 114],
+        })
+        self.assertEqual(self.rtu.server.get_stats()["requests_fc03"], 1)
+
+
+class TestModbusClientTimeouts(unittest.TestCase):
+    """Test the blocking client's handling of slow or partial responses"""
+    
+    def test_timeout_before_response_keeps_connection(self):
+        """Test a late response is skipped and the socket is reused"""
+        def handler(conn, index):
+            late_txn = _recv_request(conn)
+            txn = _recv_request(conn)  # Sent after the client timed out
+            conn.sendall(_fc03_response(late_txn, [1]) + _fc03_response(txn, [2]))
+            time.sleep(1.0)
+        
+        rtu = _ScriptedRTU(handler)
+        self.addCleanup(rtu.close)
+        client = ModbusClient('127.0.0.1', rtu.port, timeout_s=0.2)
+        self.addCleanup(client.disconnect)
+        
+        self.assertIsNone(client.read_holding_registers(0, 1))
+        self.assertTrue(client.connected)
+        self.assertEqual(client.read_holding_registers(0, 1), [2])
+        self.assertEqual(rtu.connections, 1)
+    
+    def test_timeout_mid_frame_closes_connection(self):
+        """Test a timeout inside an ADU drops the desynced socket"""
+        def handler(conn, index):
+            txn = _recv_request(conn)
+            response = _fc03_response(txn, [index + 1])
+            if index == 0:
+                # Header and one body byte only, then stall
+                conn.sendall(response[:7])
+                time.sleep(1.0)
+                conn.sendall(response[7:])
+            else:
+                conn.sendall(response)
+            time.sleep(1.0)
+        
+        rtu = _ScriptedRTU(handler)
+        self.addCleanup(rtu.close)
+        client = ModbusClient('127.0.0.1', rtu.port, timeout_s=0.2)
+        self.addCleanup(client.disconnect)
+        
+        self.assertIsNone(client.read_holding_registers(0, 1))
+        self.assertFalse(client.connected)
+        self.assertEqual(client.read_holding_registers(0, 1), [2])
+        self.assertEqual(rtu.connections, 2)
+
+
+
+class TestAsyncModbusClient(unittest.TestCase):
+    """Test the asyncio client against ModbusTCPServer and scripted peers"""
+    
+    def test_pipelined_reads_against_server(self):
+        """Test concurrent reads share one connection and get their own data"""
+        async def run():
+            server, port = await _start_server()
+            server.node.holding_registers[0:100] = range(1000, 1100)
+            client = AsyncModbusClient('127.0.0.1', port, timeout_s=2.0)
+            try:
+                results = await asyncio.gather(*(
+                    client.read_holding_registers(10 * i, 3) for i in range(10)))
+            finally:
+                await client.disconnect()
+                await server.stop()
+            return client, server, results
+        
+        client, server, results = asyncio.run(run())
+        self.assertEqual(results, [[1000 + 10 * i + k for k in range(3)]
+                                   for i in range(10)])
+        self.assertEqual(client.stats['connections'], 1)
+        self.assertEqual(server.stats['connections_total'], 1)
+    
+    def test_out_of_order_responses_matched_by_transaction_id(self):
+        """Test responses are routed by transaction ID, not arrival order"""
+        def handler(conn, index):
+            first = _recv_request(conn)
+            second = _recv_request(conn)
+            conn.sendall(_fc03_response(second, [second])
+                         + _fc03_response(first, [first]))
+            time.sleep(1.0)
+        
+        async def run():
+            client = AsyncModbusClient('127.0.0.1', rtu.port, timeout_s=2.0)
+            try:
+                return await asyncio.gather(client.read_holding_registers(0, 1),
+                                            client.read_holding_registers(1, 1))
+            finally:
+                await client.disconnect()
+        
+        rtu = _ScriptedRTU(handler)
+        self.addCleanup(rtu.close)
+        self.assertEqual(asyncio.run(run()), [[1], [2]])
+    
+    def test_timeout_then_late_reply(self):
+        """Test a reply arriving after its timeout is dropped, not misrouted"""
+        def handler(conn, index):
+            late_txn = _recv_request(conn)
+            txn = _recv_request(conn)  # Sent after the client timed out
+            conn.sendall(_fc03_response(late_txn, [1]) + _fc03_response(txn, [2]))
+            time.sleep(1.0)
+        
+        async def run():
+            client = AsyncModbusClient('127.0.0.1', rtu.port, timeout_s=0.2)
+            try:
+                first = await client.read_holding_registers(0, 1)
+                connected = client.connected
+                second = await client.read_holding_registers(0, 1)
+            finally:
+                await client.disconnect()
+            return client, first, connected, second
+        
+        rtu = _ScriptedRTU(handler)
+        self.addCleanup(rtu.close)
+        client, first, connected, second = asyncio.run(run())
+        
+        self.assertIsNone(first)
+        self.assertIn("No response", client.last_error)
+        self.assertTrue(connected)
+        self.assertEqual(second, [2])
+        self.assertEqual(rtu.connections, 1)
+        self.assertEqual(client.stats['errors'], 1)
+    
+    def test_dropped_connection_fails_pending_request(self):
+        """Test in-flight requests fail as soon as the peer closes"""
+        def handler(conn, index):
+            _recv_request(conn)
+        
+        async def run():
+            client = AsyncModbusClient('127.0.0.1', rtu.port, timeout_s=5.0)
+            try:
+                start = time.monotonic()
+                result = await client.read_holding_registers(0, 1)
+                return result, time.monotonic() - start, client.connected
+            finally:
+                await client.disconnect()
+        
+        rtu = _ScriptedRTU(handler)
+        self.addCleanup(rtu.close)
+        result, elapsed, connected = asyncio.run(run())
+        
+        self.assertIsNone(result)
+        self.assertLess(elapsed, 1.0)
+        self.assertFalse(connected)
+    
+    def test_reconnect_after_server_drops_connection(self):
+        """Test the next request reconnects after the server closes the socket"""
+        async def run():
+            server, port = await _start_server()
+            server.node.holding_registers[5] = 42
+            client = AsyncModbusClient('127.0.0.1', port, timeout_s=2.0)
+            try:
+                before = await client.read_holding_registers(5, 1)
+                for writer in list(server.connections):
+                    writer.close()
+                for _ in range(100):
+                    if not client.connected:
+                        break
+                    await asyncio.sleep(0.01)
+                dropped = not client.connected
+                after = await client.read_holding_registers(5, 1)
+            finally:
+                await client.disconnect()
+                await server.stop()
+            return client, server, before, dropped, after
+        
+        client, server, before, dropped, after = asyncio.run(run())
+        self.assertEqual(before, [42])
+        self.assertTrue(dropped)
+        self.assertEqual(after, [42])
+        self.assertEqual(client.stats['connections'], 2)
+        self.assertEqual(server.stats['connections_total'], 2)
+
+
+class TestModbusMaster(unittest.TestCase):
+    """Test concurrent polling of several RTUs"""
+    
+    def test_poll_several_rtus(self):
+        """Test each RTU answers its own request and a dead RTU gives None"""
+        async def run():
+            server_a, port_a = await _start_server()
+            server_b, port_b = await _start_server()
+            server_a.node.holding_registers[100:102] = [1, 2]
+            server_b.node.holding_registers[200:202] = [3, 4]
+            
+            # Reserve a port with nothing listening on it
+            with socket.socket() as probe:
+                probe.bind(('127.0.0.1', 0))
+                dead_port = probe.getsockname()[1]
+            
+            master = ModbusMaster(timeout_s=1.0)
+            master.add_rtu('a', '127.0.0.1', port_a)
+            master.add_rtu('b', '127.0.0.1', port_b)
+            master.add_rtu('dead', '127.0.0.1', dead_port)
+            try:
+                return await master.read_holding_registers(
+                    {'a': (100, 2), 'b': (200, 2), 'dead': (0, 1)})
+            finally:
+                await master.close()
+                await server_a.stop()
+                await server_b.stop()
+        
+        self.assertEqual(asyncio.run(run()),
+                         {'a': [1, 2], 'b': [3, 4], 'dead': None})
+
+
+
+class TestDataQuality(unittest.TestCase):
+    """Test data quality degradation"""
+    
+    def _manager(self) -> DataQualityManager:
+        """Manager tracking a few GOOD registers and one OVERFLOW register"""
+        manager = DataQualityManager()
+        for address in (0, 7, 3000, 65535):
+            manager.set_quality(address, DataQuality.GOOD)
+        manager.set_quality(42, DataQuality.OVERFLOW)
+        return manager
+    
+    def test_timeout_degradation_thresholds(self):
+        """Test GOOD holds for 2 misses, is SUSPECT from 3 and BAD from 10"""
+        manager = self._manager()
+        expected = ([DataQuality.GOOD] * 2 + [DataQuality.SUSPECT] * 7
+                    + [DataQuality.BAD] * 3)
+        for quality in expected:
+            manager.mark_communication_timeout(7)
+            self.assertEqual(manager.get_quality(7), quality)
+    
+    def test_device_timeout_matches_per_register_timeout(self):
+        """Test mark_all_communication_timeout equals marking each register"""
+        vectorized = self._manager()
+        per_register = self._manager()
+        tracked = np.flatnonzero(per_register._tracked).tolist()
+        
+        for _ in range(12):
+            vectorized.mark_all_communication_timeout()
+            for address in tracked:
+                per_register.mark_communication_timeout(address)
+            
+            np.testing.assert_array_equal(vectorized._quality, per_register._quality)
+            np.testing.assert_array_equal(vectorized._tracked, per_register._tracked)
+            np.testing.assert_array_equal(vectorized._missed_polls,
+                                          per_register._missed_polls)
+            np.testing.assert_array_equal(vectorized._last_update > 0,
+                                          per_register._last_update > 0)
+        
+        # A good poll after the outage resets both the same way
+        vectorized.set_quality(3000, DataQuality.GOOD)
+        per_register.set_quality(3000, DataQuality.GOOD)
+        vectorized.mark_all_communication_timeout()
+        per_register.mark_communication_timeout(3000)
+        for address in tracked:
+            if address != 3000:
+                per_register.mark_communication_timeout(address)
+        np.testing.assert_array_equal(vectorized._quality, per_register._quality)
+        np.testing.assert_array_equal(vectorized._missed_polls,
+                                      per_register._missed_polls)
+
+
+
+class TestEncodeBlock(unittest.TestCase):
+    """Test vectorized register encoding matches the scalar encoders"""
+    
+    NODE_TYPES = ("GENERATION", "TRANSMISSION", "DISTRIBUTION")
+    
+    def _scalar(self, addresses, values):
+        """Encode register by register with encode_register"""
+        return [encode_register(int(a), float(v)) for a, v in zip(addresses, values)]
+    
+    def test_matches_scalar_encoders(self):
+        """Test every register encodes as its scalar encoder, signs included"""
+        rng = np.random.default_rng(7)
+        for node_type in self.NODE_TYPES:
+            addresses, scales, defaults = get_scale_vector(node_type)
+            values = rng.uniform(-500.0, 500.0, len(addresses))
+            values[::3] = np.round(values[::3], 1) + 0.05  # Ties at scale 10
+            
+            encoded = encode_block(values, scales, defaults)
+            self.assertEqual(encoded.tolist(), self._scalar(addresses, values))
+    
+    def test_signed_values(self):
+        """Test negative readings stay negative and wrap to two's complement"""
+        self.assertEqual(encode_power_mw(-5.0), -50)
+        encoded = encode_block([-5.0, -0.05, 0.05], np.full(3, 10.0),
+                               np.full(3, np.nan))
+        self.assertEqual(encoded.tolist(), [-50, -1, 1])
+        self.assertEqual(encoded.astype(np.uint16).tolist(), [65486, 65535, 1])
+    
+    def test_non_finite_values(self):
+        """Test non-finite frequency encodes as nominal and other values raise"""
+        addresses, scales, defaults = get_scale_vector("GENERATION")
+        names = {address: name for name, address in
+                 ModbusRegisterMap.get_register_map("GENERATION").items()}
+        is_hz = np.array([names[a].endswith("_hz") for a in addresses])
+        self.assertTrue(is_hz.any())
+        
+        for bad in (np.nan, np.inf, -np.inf):
+            values = np.where(is_hz, bad, 1.0)
+            encoded = encode_block(values, scales, defaults)
+            self.assertEqual(encoded.tolist(), self._scalar(addresses, values))
+            self.assertEqual(encoded[is_hz].tolist(),
+                             [encode_frequency_hz(bad)] * int(is_hz.sum()))
+            self.assertEqual(encode_frequency_hz(bad), 50000)
+            
+            values = np.where(is_hz, 50.0, bad)
+            with self.assertRaises(ValueError):
+                encode_block(values, scales, defaults)
+        
+        with self.assertRaises(ValueError):
+            encode_power_mw(float('nan'))
+
+
+if __name__ == '__main__':
+    unittest.main()
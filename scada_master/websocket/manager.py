@@ -4,6 +4,7 @@ WebSocket Manager - Broadcast to dashboard clients
 import asyncio
 import json
 import logging
+import time
 from datetime import datetime
 from typing import Set, Dict
 from fastapi import WebSocket, WebSocketDisconnect
@@ -20,7 +21,8 @@ class WebSocketManager:
         self.broadcast_task = None
         
         # Throttling - limit telemetry broadcasts to 1Hz per node
-        self.last_broadcast_time = defaultdict(lambda: datetime.min)
+        # (time.monotonic() of the last broadcast)
+        self.last_broadcast_time = defaultdict(lambda: float("-inf"))
         self.telemetry_throttle_seconds = 1.0
     
     async def connect(self, websocket: WebSocket, username: str):
@@ -64,11 +66,8 @@ class WebSocketManager:
         # Throttle telemetry updates
         if message.get("type") == "telemetry_update":
             node_id = message.get("node_id")
-            now = datetime.utcnow()
-            last_time = self.last_broadcast_time[node_id]
-            
-            elapsed = (now - last_time).total_seconds()
-            if elapsed < self.telemetry_throttle_seconds:
+            now = time.monotonic()
+            if now - self.last_broadcast_time[node_id] < self.telemetry_throttle_seconds:
                 return  # Skip this update
             
             self.last_broadcast_time[node_id] = now
@@ -92,11 +91,8 @@ class WebSocketManager:
         """Background loop to broadcast queued messages"""
         while self.running:
             try:
-                # Get message from queue with timeout
-                try:
-                    message = await asyncio.wait_for(self.message_queue.get(), timeout=0.1)
-                except asyncio.TimeoutError:
-                    continue
+                # Wait for the next message (stop_broadcasting cancels the task)
+                message = await self.message_queue.get()
                 
                 # Broadcast to all connected clients
                 disconnected = set()